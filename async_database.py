@@ -0,0 +1,49 @@
+"""
+Fachada assíncrona do NewsDatabase para os handlers do bot
+Cada chamada roda em um pool pequeno de threads dedicado ao banco, fora do
+event loop. Cada thread do pool abre a sua própria conexão persistente (ver
+NewsDatabase._get_connection), então consultas dos handlers não disputam a
+conexão do scraping nem bloqueiam o loop enquanto aguardam o lock de escrita.
+
+Uso: await adb.get_stats(), com os mesmos argumentos do método síncrono.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DB_EXECUTOR_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNewsDatabase:
+    """Expõe os métodos do NewsDatabase como corrotinas executadas no pool do banco"""
+
+    def __init__(self, db, max_workers=DB_EXECUTOR_WORKERS):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    async def run(self, func, *args, **kwargs):
+        """Executa uma função bloqueante qualquer no pool do banco"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attribute = getattr(self.db, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+
+        # Guarda a corrotina para não recriá-la a cada chamada
+        setattr(self, name, call)
+        return call
+
+    def shutdown(self):
+        """Aguarda as consultas em andamento e encerra o pool (as conexões fecham em db.close())"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        logger.info("🗄️ Pool do banco finalizado")
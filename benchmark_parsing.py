@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parsing das páginas de listagem do SimpleRobustScraper
+Gera listagens sintéticas no estilo dos portais (gov.br e afins, ~750 KB com
+menus, scripts e rodapé) para as configurações que usam 'parse_only' e mede
+tempo e pico de memória de html.parser, lxml e lxml com SoupStrainer. Também
+confere se as notícias extraídas são as mesmas nos três casos.
+
+Uso: python benchmark_parsing.py [--sites "PRF Nacional" "BM RS"] [--size-kb 750] [--repeat 5]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+
+import html_parsing
+from page_cache import PendingValidators
+from simple_robust_scraper import SimpleRobustScraper
+
+# Tag que envolve cada notícia em cada portal (a mesma de 'parse_only')
+HEADING_TAGS = {
+    'PRF Nacional': 'h2',
+    'BM RS': 'h3',
+    'MP RS': 'h2',
+}
+
+TITLES = [
+    "Operação da PRF apreende 2 toneladas de maconha na BR-290",
+    "Polícia prende suspeitos de tráfico de drogas em Porto Alegre",
+    "Apreensão de armas e munição em Caxias do Sul",
+    "Brigada Militar realiza operação contra facção em Canoas",
+    "Campanha de vacinação dos servidores começa na segunda-feira",
+    "Inscrições abertas para o concurso público de 2025",
+    "GAECO deflagra operação contra lavagem de dinheiro",
+    "Cocaína é encontrada em fundo falso de caminhão",
+    "Feriado altera horário de atendimento ao público",
+    "Prisão em flagrante de motorista com ecstasy na fronteira",
+]
+
+
+def _filler(rng, size):
+    """Blocos de menu, texto e script típicos das páginas dos portais (~size bytes)"""
+    parts = []
+    total = 0
+    while total < size:
+        block = rng.choice((
+            '<nav class="menu"><ul>' + "".join(
+                f'<li><a href="/institucional/pagina-{rng.randrange(10000)}">Item de menu {i}</a></li>'
+                for i in range(20)) + '</ul></nav>',
+            '<div class="portlet"><p>' + " ".join(
+                rng.choice(("texto", "institucional", "serviços", "acesso", "informação", "cidadão"))
+                for _ in range(120)) + '</p></div>',
+            '<script type="text/javascript">var config = {' + ",".join(
+                f'"k{i}": "{rng.randrange(10 ** 8)}"' for i in range(60)) + '};</script>',
+            '<footer><div class="links"><span class="date">01/01/2024</span>'
+            '<a href="https://www.gov.br/acessibilidade">Acessibilidade</a></div></footer>',
+        ))
+        parts.append(block)
+        total += len(block)
+    return "".join(parts)
+
+
+def synthetic_listing(site, articles=20, size_kb=750, seed=42):
+    """HTML de uma listagem com `articles` notícias no meio de ~size_kb de conteúdo"""
+    rng = random.Random(seed)
+    tag = HEADING_TAGS[site]
+    items = []
+    for i in range(articles):
+        title = f"{TITLES[i % len(TITLES)]} ({i})"
+        items.append(
+            f'<div class="tileItem"><{tag} class="tileHeadline">'
+            f'<a href="/noticias/2024/noticia-{i}">{title}</a></{tag}>'
+            f'<span class="documentByLine date">{1 + i % 28:02d}/03/2024 10:{i % 60:02d}</span>'
+            f'<p class="description">Resumo da notícia {i}.</p></div>'
+        )
+
+    filler = size_kb * 1024 // 2
+    return (
+        '<!DOCTYPE html><html lang="pt-br"><head><meta charset="utf-8"><title>Notícias</title>'
+        f'<style>{"." * 2000}</style></head><body>'
+        f'<header>{_filler(rng, filler)}</header>'
+        f'<main id="content"><h1>Notícias</h1>{"".join(items)}</main>'
+        f'<aside>{_filler(rng, filler)}</aside>'
+        '</body></html>'
+    ).encode('utf-8')
+
+
+def extract(scraper, config, content, strained):
+    """Notícias extraídas de uma listagem, com ou sem o 'parse_only' da configuração"""
+    if not strained:
+        config = {key: value for key, value in config.items() if key != 'parse_only'}
+    items = scraper._parse_listing(config, content, PendingValidators())
+    # Sem o cache '_normalized' (objetos NormalizedText não se comparam por valor)
+    return [{key: value for key, value in item.items() if key != '_normalized'} for item in items]
+
+
+def measure(func, repeat):
+    """Mediana em segundos e pico de memória (MB) de `repeat` execuções"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def run(scraper, config, size_kb, repeat):
+    content = synthetic_listing(config['name'], size_kb=size_kb)
+    print(f"\n{config['name']}: {len(content) / 1024:.0f} KB, parse_only={config['parse_only']}")
+
+    default_parser = html_parsing.PARSER
+    cases = [('html.parser', 'html.parser', False), ('lxml', 'lxml', False), ('lxml + strainer', 'lxml', True)]
+    reference = None
+    try:
+        for label, parser, strained in cases:
+            html_parsing.PARSER = parser
+            items = extract(scraper, config, content, strained)
+            if reference is None:
+                reference = items
+            elapsed, peak = measure(lambda: extract(scraper, config, content, strained), repeat)
+            same = "iguais" if items == reference else "DIFERENTES"
+            print(f"  {label:<18}{elapsed:>8.3f} s  pico {peak:>6.1f} MB  {len(items)} notícias ({same})")
+    finally:
+        html_parsing.PARSER = default_parser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sites', nargs='+', default=list(HEADING_TAGS))
+    parser.add_argument('--size-kb', type=int, default=750)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    scraper = SimpleRobustScraper()
+    configs = {config['name']: config for config in scraper.get_scraping_configs()}
+    for site in args.sites:
+        run(scraper, configs[site], args.size_kb, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
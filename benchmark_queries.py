@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark das consultas de listagem do NewsDatabase
+Gera bancos sintéticos (100 mil e 1 milhão de notícias por padrão) e mede a
+latência de cada consulta usada pelo bot com e sem os índices das migrações.
+
+Uso: python benchmark_queries.py [--rows 100000 1000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database import NewsDatabase, SCHEMA_MIGRATIONS
+
+SOURCES = [
+    'Polícia Civil RS', 'Brigada Militar RS', 'PRF', 'Ministério Público RS',
+    'GZH', 'Correio do Povo', 'Scraping Robusto - PRF', 'Scraping Robusto - BM RS'
+]
+CATEGORIES = ['tráfico', 'drogas', 'apreensão', 'operação', 'prisão', 'geral']
+
+
+def populate(db, rows, batch_size=50000):
+    """Insere notícias sintéticas espalhadas pelos últimos dois anos"""
+    rng = random.Random(42)
+    start = datetime.now() - timedelta(days=730)
+
+    with db._get_connection() as conn:
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, rows)):
+                created_at = start + timedelta(seconds=rng.randrange(730 * 24 * 3600))
+                batch.append((
+                    f"Notícia {i} sobre {rng.choice(CATEGORIES)}",
+                    "Conteúdo sintético da notícia",
+                    f"https://example.com/noticia/{i}",
+                    rng.choice(SOURCES),
+                    rng.choice(CATEGORIES),
+                    'Porto Alegre',
+                    created_at.strftime('%Y-%m-%d'),
+                    created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    rng.random() < 0.9,  # a maioria já foi enviada
+                    rng.random() < 0.95  # e visualizada
+                ))
+            conn.executemany('''
+                INSERT INTO news (title, content, url, source, category, location,
+                                  published_date, created_at, sent_to_telegram, viewed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', batch)
+        conn.execute("ANALYZE")
+
+
+# Índices de listagem (migração 2); as demais migrações e os dados ficam intactos
+INDEX_STATEMENTS = next(steps for version, _, steps in SCHEMA_MIGRATIONS if version == 2)
+
+
+def set_indexes(db, enabled):
+    """Remove ou recria só os índices de listagem, sem mexer no user_version nem nos dados"""
+    with db._get_connection() as conn:
+        for statement in INDEX_STATEMENTS:
+            name = statement.split("IF NOT EXISTS ")[1].split()[0]
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        if enabled:
+            for statement in INDEX_STATEMENTS:
+                conn.execute(statement)
+        conn.execute("ANALYZE")
+
+
+def deep_cursors(db, rows):
+    """Cursores (created_at, id) no meio de cada listagem, para medir páginas profundas"""
+    depth = rows // 2
+    cursors = {}
+    with db._get_connection() as conn:
+        for name, where, params in (('all', '', ()), ('source', 'WHERE source = ?', ('PRF',))):
+            cursors[name] = conn.execute(
+                f"SELECT created_at, id FROM news {where} ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?",
+                params + (depth // 8 if name == 'source' else depth,)
+            ).fetchone()
+    return cursors
+
+
+def query_shapes(rows, cursors):
+    """Consultas do bot, na forma em que os handlers as chamam"""
+    middle = rows // 2
+    return [
+        ("get_all_news(20)", lambda db: db.get_all_news(20)),
+        ("get_unviewed_news(10)", lambda db: db.get_unviewed_news(10)),
+        ("get_viewed_news(10)", lambda db: db.get_viewed_news(10)),
+        ("get_unsent_news(10)", lambda db: db.get_unsent_news(10)),
+        ("get_news_by_source(15)", lambda db: db.get_news_by_source('PRF', 15)),
+        ("get_news_by_category(10)", lambda db: db.get_news_by_category('drogas', 10)),
+        ("news_exists_by_title", lambda db: db.news_exists_by_title(f"Notícia {middle} sobre drogas", 'PRF')),
+        ("get_recent_activities(10)", lambda db: db.get_recent_activities(10)),
+        ("get_stats", lambda db: db.get_stats()),
+        # Paginação por cursor: a página do meio deve custar o mesmo que a primeira
+        ("all_page(primeira)", lambda db: db.get_all_news_page(limit=10)),
+        ("all_page(meio)", lambda db: db.get_all_news_page(cursors['all'], limit=10)),
+        ("all_page(meio, newer)", lambda db: db.get_all_news_page(cursors['all'], 'newer', 10)),
+        ("source_page(primeira)", lambda db: db.get_news_page_by_source('PRF', limit=10)),
+        ("source_page(meio)", lambda db: db.get_news_page_by_source('PRF', cursors['source'], limit=10)),
+    ]
+
+
+def measure(db, func, repeat):
+    """Mediana em milissegundos de `repeat` execuções (após um aquecimento)"""
+    func(db)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(db)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run(rows, repeat):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = NewsDatabase(os.path.join(tmpdir, 'benchmark.db'))
+
+        started = time.perf_counter()
+        populate(db, rows)
+        print(f"\n{rows:,} notícias (geradas em {time.perf_counter() - started:.1f}s, "
+              f"schema v{SCHEMA_MIGRATIONS[-1][0]})")
+
+        cursors = deep_cursors(db, rows)
+        results = {}
+        for enabled in (False, True):
+            set_indexes(db, enabled)
+            for name, func in query_shapes(rows, cursors):
+                results.setdefault(name, []).append(measure(db, func, repeat))
+
+        print(f"{'consulta':<28}{'sem índices':>14}{'com índices':>14}{'ganho':>10}")
+        for name, (without, with_) in results.items():
+            speedup = without / with_ if with_ else float('inf')
+            print(f"{name:<28}{without:>11.2f} ms{with_:>11.2f} ms{speedup:>9.0f}x")
+
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
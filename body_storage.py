@@ -0,0 +1,54 @@
+"""
+Compressão do corpo das notícias (tabela news_body)
+Usa o zlib da biblioteca padrão; o zstd (pacote zstandard, opcional) pode ser
+escolhido em NEWS_BODY_CODEC. O codec vai gravado junto de cada corpo, então
+bancos com corpos dos dois formatos continuam legíveis onde o zstandard
+estiver instalado.
+"""
+
+import logging
+import zlib
+
+from config import NEWS_BODY_CODEC
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB = 'zlib'
+ZSTD = 'zstd'
+
+# Nível de compressão de cada codec (corpos curtos, gravados uma vez e lidos muitas)
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 9
+
+
+def default_codec():
+    """Codec usado nas novas gravações: NEWS_BODY_CODEC, ou o melhor disponível em 'auto'"""
+    if NEWS_BODY_CODEC == ZSTD and zstandard is None:
+        logger.warning("zstandard não instalado, comprimindo os corpos com zlib")
+        return ZLIB
+    if NEWS_BODY_CODEC == 'auto':
+        return ZSTD if zstandard is not None else ZLIB
+    return NEWS_BODY_CODEC
+
+
+def compress_body(text, codec=None):
+    """Comprime o texto de uma notícia; retorna (codec, bytes)"""
+    codec = codec or default_codec()
+    data = text.encode('utf-8')
+    if codec == ZSTD:
+        return codec, zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return ZLIB, zlib.compress(data, _ZLIB_LEVEL)
+
+
+def decompress_body(codec, blob):
+    """Inverso de compress_body"""
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Corpo comprimido com zstd, mas o pacote zstandard não está instalado")
+        return zstandard.ZstdDecompressor().decompress(blob).decode('utf-8')
+    return zlib.decompress(blob).decode('utf-8')
@@ -5,17 +5,27 @@ Bot simples e funcional sem problemas de formatação
 """
 
 import logging
-import schedule
-import threading
 import asyncio
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES
 from datetime import datetime
 from database import NewsDatabase
 from news_scrapers import NewsScraper
 from simple_robust_scraper import SimpleRobustScraper
-from config.config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
+from page_cache import PageCache
+from scrape_coordinator import ScrapeCoordinator
+from metrics import job_metrics
+from broadcast import Broadcaster
+from outbox import OutboxDispatcher
+from async_database import AsyncNewsDatabase
+from retention import RetentionManager
+from pagination import OLDER, NEWER, encode_cursor, build_page_callback, parse_page_callback
+from config.config import (TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, SCRAPE_EXECUTOR_WORKERS, REFRESH_FRESHNESS_WINDOW,
+                           UPDATE_INTERVAL, CLEANUP_INTERVAL, JOB_JITTER_SECONDS, NEWS_PAGE_SIZE)
 
 # Configuração de logging
 logging.basicConfig(
@@ -27,7 +37,9 @@ logger = logging.getLogger(__name__)
 class NewsBot:
     def __init__(self):
         self.db = NewsDatabase()
-        self.robust_scraper = SimpleRobustScraper()
+        self.adb = AsyncNewsDatabase(self.db)  # Consultas dos handlers, fora do event loop
+        self.retention = RetentionManager(self.db)  # Limpeza periódica (cleanup_job)
+        self.robust_scraper = SimpleRobustScraper(page_cache=PageCache(self.db))
         
         # Mapeamento de emojis para fontes (na ordem solicitada)
         self.source_emojis = {
@@ -43,8 +55,38 @@ class NewsBot:
             'MP RS': '⚖️',
             'Todas as Fontes': '📰'
         }
+        
+        # Mapeamento de fontes (callback_data) para nomes no banco de dados
+        self.source_names = {
+            "prf": "PRF Nacional",
+            "pf": "PF Nacional",
+            "pc_rs": "PC RS",
+            "bm_rs": "BM RS",
+            "pc_sc": "PC SC",
+            "pm_sc": "PM SC",
+            "pc_pr": "PC PR",
+            "pm_pr": "PM PR",
+            "dof_ms": "DOF MS",
+            "mp_rs": "MP RS",
+            "all": "Todas as Fontes"
+        }
         self.scraper = NewsScraper()
         self.application = None  # Será definido quando o bot iniciar
+        self.broadcaster = None  # Criado junto com a aplicação (usa application.bot)
+        self.outbox = None  # Fila persistente de mensagens (drenada pelo Broadcaster)
+        
+        # Executor dedicado ao trabalho bloqueante (requests, time.sleep, SQLite),
+        # para que o event loop do Telegram continue respondendo durante o scraping
+        self.scrape_executor = ThreadPoolExecutor(
+            max_workers=SCRAPE_EXECUTOR_WORKERS,
+            thread_name_prefix="scrape"
+        )
+        
+        # Um único ciclo de scraping por vez, compartilhado por todos os pedidos
+        self.scrape_coordinator = ScrapeCoordinator(
+            self._run_full_scrape_cycle,
+            freshness_window=REFRESH_FRESHNESS_WINDOW
+        )
         
         # Configura os teclados
         self._setup_keyboards()
@@ -55,6 +97,104 @@ class NewsBot:
         clean_source = source.replace("Scraping Robusto - ", "")
         return self.source_emojis.get(clean_source, "📰")
     
+    def _format_news_item(self, index, news, content=""):
+        """Formata uma notícia (linha do banco e corpo já carregado) como item de uma página"""
+        title = news[1]
+        content = (content or "").strip()
+        url = news[3]
+        source = news[4]
+        category = news[5] if news[5] else "Geral"
+        published_date = news[7]
+        viewed = news[10]
+        
+        # Status de visualização e fonte
+        view_status = "👁️" if viewed else "🆕"
+        source_emoji = self.get_source_emoji(source)
+        clean_source = source.replace("Scraping Robusto - ", "")
+        item = f"{index}. {view_status} {source_emoji} {clean_source}\n{title}\n"
+        
+        # Resumo curto (só quando há conteúdo além do título)
+        if len(content) > 10 and content != title:
+            if len(content) > 200:
+                content = content[:200] + "..."
+            item += f"📝 {content}\n"
+        
+        # Formata a data se disponível
+        formatted_date = ""
+        if published_date:
+            try:
+                dt = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
+                formatted_date = f" · 📅 {dt.strftime('%d/%m/%Y %H:%M')}"
+            except (ValueError, TypeError):
+                formatted_date = f" · 📅 {published_date}"
+        
+        item += f"🏷️ {category.title()}{formatted_date}\n"
+        item += f"🔗 {url}"
+        return item
+    
+    async def _build_news_page(self, view, arg=None, page=1, direction=OLDER, cursor=None):
+        """
+        Monta uma página de notícias (texto e teclado inline) para uma única mensagem
+        
+        view: 'u' (não lidas), 'a' (todas as fontes) ou 's' (fonte; arg = chave da fonte)
+        Retorna None se a página estiver vazia
+        """
+        db_direction = 'newer' if direction == NEWER else 'older'
+        if view == 's':
+            source_name = self.source_names.get(arg, arg)
+            header = f"📰 {source_name}"
+            result = await self.adb.get_news_page_by_source(source_name, cursor, db_direction, NEWS_PAGE_SIZE)
+            back_button = InlineKeyboardButton("⬅️ Voltar às Fontes", callback_data="menu_viewed")
+        elif view == 'a':
+            header = "📰 Todas as Fontes"
+            result = await self.adb.get_all_news_page(cursor, db_direction, NEWS_PAGE_SIZE)
+            back_button = InlineKeyboardButton("⬅️ Voltar às Fontes", callback_data="menu_viewed")
+        else:
+            header = "📰 Últimas Notícias (não lidas)"
+            result = await self.adb.get_unviewed_news_page(cursor, db_direction, NEWS_PAGE_SIZE)
+            back_button = InlineKeyboardButton("📋 Menu", callback_data="menu_main")
+        
+        items = result['items']
+        if not items:
+            return None
+        if not result['has_newer']:
+            page = 1
+        
+        # Corpo das notícias (comprimido em news_body) só para os itens desta página
+        bodies = await self.adb.get_news_bodies(news[0] for news in items)
+        
+        # Um item por notícia, com um botão numerado para marcar como lida
+        blocks = [f"{header} · Página {page}"]
+        mark_buttons = []
+        for index, news in enumerate(items, (page - 1) * NEWS_PAGE_SIZE + 1):
+            blocks.append(self._format_news_item(index, news, bodies.get(news[0])))
+            if news[10]:
+                mark_buttons.append(InlineKeyboardButton(f"☑️ {index}", callback_data="already_read"))
+            else:
+                mark_buttons.append(InlineKeyboardButton(f"✅ {index}", callback_data=f"mark_read_{news[0]}"))
+        blocks.append("✅ N = marcar a notícia N como lida")
+        
+        # Navegação por cursor: ◀️ mais recentes, ▶️ mais antigas
+        navigation = []
+        if result['has_newer']:
+            navigation.append(InlineKeyboardButton(
+                "◀️", callback_data=build_page_callback(view, arg, page - 1, NEWER, encode_cursor(*result['newer_cursor']))
+            ))
+        if result['has_older']:
+            navigation.append(InlineKeyboardButton(
+                "▶️", callback_data=build_page_callback(view, arg, page + 1, OLDER, encode_cursor(*result['older_cursor']))
+            ))
+        
+        keyboard = [mark_buttons]
+        if navigation:
+            keyboard.append(navigation)
+        keyboard.append([back_button])
+        
+        text = "\n\n".join(blocks)
+        if len(text) > 4096:
+            text = text[:4093] + "..."
+        return text, InlineKeyboardMarkup(keyboard)
+    
     def _setup_keyboards(self):
         """Configura todos os teclados do bot"""
         # Teclado fixo na parte inferior - apenas o botão MENU
@@ -80,26 +220,10 @@ class NewsBot:
         
     
     
-    def _get_available_sources(self):
-        """Retorna fontes com notícias disponíveis"""
+    async def _get_available_sources(self):
+        """Retorna fontes com notícias disponíveis (nome limpo -> quantidade)"""
         try:
-            all_news = self.db.get_all_news()
-            source_counts = {}
-            
-            for news in all_news:
-                source = news[4]
-                source_counts[source] = source_counts.get(source, 0) + 1
-            
-            # Remove prefixo "Scraping Robusto - " para exibição mais limpa
-            clean_sources = {}
-            for source, count in source_counts.items():
-                if source.startswith("Scraping Robusto - "):
-                    clean_name = source.replace("Scraping Robusto - ", "")
-                else:
-                    clean_name = source
-                clean_sources[clean_name] = count
-            
-            return clean_sources
+            return dict(await self.adb.get_source_counts())
         except Exception as e:
             logger.error(f"Error getting available sources: {e}")
             return {}
@@ -131,32 +255,40 @@ class NewsBot:
         # Se não encontrar, retorna nome genérico
         return 'Fonte Oficial'
     
+    async def run_blocking(self, func, *args, **kwargs):
+        """Executa uma função bloqueante no executor de scraping e aguarda o resultado"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.scrape_executor, partial(func, *args, **kwargs))
+    
+    async def scrape_all_news_traditional(self):
+        """Faz scraping das fontes tradicionais fora do event loop e salva no banco"""
+        traditional_list, validators = await self.run_blocking(self.scraper.scrape_all_sources)
+        # Sempre grava: mesmo sem notícias, os validadores das páginas lidas precisam ir para o banco
+        saved_count = await self.run_blocking(self.scraper.save_news_to_db, traditional_list, validators)
+        return len(traditional_list), saved_count
+    
     async def scrape_all_news_robust(self):
         """Faz scraping de todas as fontes robustas e salva no banco"""
         try:
             logger.info("🔄 Iniciando scraping robusto de todas as fontes...")
-            news_list = self.robust_scraper.scrape_all_sites()
+            news_list, validators = await self.robust_scraper.scrape_all_sites_with_validators_async()
             
             found_count = len(news_list)
-            saved_count = 0
-            for news in news_list:
-                try:
-                    # O scraper robusto já fornece o nome correto da fonte
-                    source_name = news.get('source', 'Fonte Oficial')
-                    
-                    # Salva no banco de dados (só incrementa se realmente salvou)
-                    if self.db.add_news(
-                        title=news['title'],
-                        content='',  # Conteúdo não é extraído no scraper simples
-                        url=news['link'],
-                        source=source_name,
-                        category=news.get('category', 'geral'),
-                        published_date=news.get('date', '')
-                    ):
-                        saved_count += 1
-                except Exception as e:
-                    logger.error(f"Erro ao salvar notícia: {e}")
-                    continue
+            
+            # O scraper robusto já fornece o nome correto da fonte; conteúdo não é extraído
+            new_items = await self.run_blocking(self.db.add_news_bulk, [
+                {
+                    'title': news['title'],
+                    'content': '',
+                    'url': news['link'],
+                    'source': news.get('source', 'Fonte Oficial'),
+                    'category': news.get('category', 'geral'),
+                    'location': news.get('location'),
+                    'published_date': news.get('date', '')
+                }
+                for news in news_list
+            ], validators.http_entries, validators.listings)
+            saved_count = len(new_items)
             
             logger.info(f"✅ Scraping robusto concluído: {found_count} encontradas, {saved_count} salvas")
             return found_count, saved_count
@@ -165,12 +297,38 @@ class NewsBot:
             logger.error(f"❌ Erro no scraping robusto: {e}")
             return 0, 0
     
+    async def _run_full_scrape_cycle(self):
+        """Ciclo completo de scraping (robusto + tradicional); use via scrape_coordinator"""
+        total_found = 0
+        total_saved = 0
+        
+        # 1. Busca via scraping robusto (Fontes oficiais)
+        try:
+            robust_found, robust_saved = await self.scrape_all_news_robust()
+            total_found += robust_found
+            total_saved += robust_saved
+            logger.info(f"Scraping Robusto: {robust_found} encontradas, {robust_saved} salvas")
+        except Exception as e:
+            logger.error(f"Erro no Scraping Robusto: {e}")
+        
+        # 2. Busca via scraping tradicional (fallback)
+        try:
+            found_traditional, saved_traditional = await self.scrape_all_news_traditional()
+            if found_traditional:
+                total_found += found_traditional
+                total_saved += saved_traditional
+                logger.info(f"Tradicional: {found_traditional} encontradas, {saved_traditional} salvas")
+        except Exception as e:
+            logger.error(f"Erro Scraping Tradicional: {e}")
+        
+        return total_found, total_saved
+    
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /start - Mensagem de boas-vindas"""
         # Registra o usuário para receber notificações
         user = update.effective_user
         if user:
-            self.db.add_active_user(
+            await self.adb.add_active_user(
                 user_id=str(user.id),
                 username=user.username,
                 first_name=user.first_name,
@@ -198,7 +356,7 @@ Use o botão **📋 MENU** abaixo para acessar:
 Digite /help para ver todos os comandos disponíveis."""
         
         await update.message.reply_text(welcome_message, reply_markup=self.reply_keyboard)
-        self.db.log_activity("Bot started", f"User: {update.effective_user.username}")
+        await self.adb.log_activity("Bot started", f"User: {update.effective_user.username}")
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /help - Lista de comandos"""
@@ -218,11 +376,11 @@ Digite /help para ver todos os comandos disponíveis."""
         await update.message.reply_text(help_message, reply_markup=self.reply_keyboard)
     
     async def latest_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Comando /latest - Mostra as notícias não visualizadas"""
+        """Comando /latest - Mostra as notícias não visualizadas (paginadas)"""
         try:
-            news_list = self.db.get_unviewed_news(limit=10)
+            page = await self._build_news_page('u')
             
-            if not news_list:
+            if page is None:
                 error_msg = "📭 Nenhuma notícia encontrada. Use '📋 MENU' para buscar."
                 if update.callback_query:
                     await update.callback_query.edit_message_text(error_msg)
@@ -230,96 +388,12 @@ Digite /help para ver todos os comandos disponíveis."""
                     await update.message.reply_text(error_msg, reply_markup=self.reply_keyboard)
                 return
             
-            # Envia mensagem inicial
-            total_count = len(news_list)
-            initial_msg = f"📰 Encontradas {total_count} notícias relevantes:\n\nEnviando cada notícia separadamente..."
-            
-            if update.callback_query:
-                await update.callback_query.edit_message_text(initial_msg)
-            else:
-                await update.message.reply_text(initial_msg, reply_markup=self.reply_keyboard)
-            
-            # Envia cada notícia em mensagem separada
-            for i, news in enumerate(news_list[:10], 1):
-                try:
-                    title = news[1]
-                    content = news[2] if news[2] else ""
-                    source = news[4]
-                    category = news[5] if news[5] else "Geral"
-                    url = news[3]
-                    published_date = news[6] if len(news) > 6 and news[6] else "Data não disponível"
-                    
-                    category_emoji = {
-                        'drogas': '🚨',
-                        'armas': '🔫',
-                        'tráfico': '🚨',
-                        'facções': '👥'
-                    }.get(category, '📰')
-                    
-                    # Formata a data se disponível
-                    formatted_date = ""
-                    if published_date and published_date != "Data não disponível":
-                        try:
-                            if 'T' in published_date:
-                                dt = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
-                                formatted_date = f"📅 {dt.strftime('%d/%m/%Y %H:%M')}\n"
-                        except (ValueError, TypeError):
-                            formatted_date = f"📅 {published_date}\n"
-                    
-                    # Cria mensagem detalhada para cada notícia
-                    source_emoji = self.get_source_emoji(source)
-                    clean_source = source.replace("Scraping Robusto - ", "")
-                    message = f"{source_emoji} {clean_source}\n\n"
-                    
-                    # Adiciona resumo (usa título se não há conteúdo)
-                    if content and len(content.strip()) > 10:
-                        if len(content) > 800:
-                            content = content[:800] + "..."
-                        message += f"📝 Resumo:\n{content}\n\n"
-                    else:
-                        # Usa o título como resumo se não há conteúdo
-                        message += f"📝 Resumo:\n{title}\n\n"
-                    
-                    # Informações da notícia
-                    message += f"🏷️ Categoria: {category.title()}\n"
-                    message += formatted_date
-                    message += f"🔗 {url}"
-                    
-                    # Cria botão para marcar como lida
-                    news_id = news[0]  # ID da notícia
-                    inline_keyboard = InlineKeyboardMarkup([
-                        [InlineKeyboardButton("✅ Marcar como Lida", callback_data=f"mark_read_{news_id}")]
-                    ])
-                    
-                    # Para callbacks, usa context.bot.send_message
-                    if update.callback_query:
-                        await context.bot.send_message(
-                            chat_id=update.callback_query.message.chat_id,
-                            text=message,
-                            reply_markup=inline_keyboard,
-                            disable_web_page_preview=True
-                        )
-                    else:
-                        await update.message.reply_text(message, reply_markup=inline_keyboard, disable_web_page_preview=True)
-                    
-                    # Pequena pausa entre mensagens
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao enviar notícia {i}: {e}")
-                    continue
-            
-            # Mensagem final
-            final_msg = f"✅ Concluído! {total_count} notícias enviadas.\n\nUse '📋 MENU' para mais opções:"
-            
+            # Uma única mensagem com a primeira página
+            text, inline_keyboard = page
             if update.callback_query:
-                await context.bot.send_message(
-                    chat_id=update.callback_query.message.chat_id,
-                    text=final_msg,
-                    reply_markup=self.reply_keyboard
-                )
+                await update.callback_query.edit_message_text(text, reply_markup=inline_keyboard, disable_web_page_preview=True)
             else:
-                await update.message.reply_text(final_msg, reply_markup=self.reply_keyboard)
+                await update.message.reply_text(text, reply_markup=inline_keyboard, disable_web_page_preview=True)
             
         except Exception as e:
             logger.error(f"Error in latest_command: {e}")
@@ -329,6 +403,31 @@ Digite /help para ver todos os comandos disponíveis."""
             else:
                 await update.message.reply_text(error_msg, reply_markup=self.reply_keyboard)
     
+    async def news_page_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Callback de navegação (◀️/▶️): edita a mensagem com a nova página"""
+        query = update.callback_query
+        await query.answer()
+        
+        try:
+            request = parse_page_callback(query.data)
+            page = await self._build_news_page(request.view, request.arg, request.page, request.direction, request.cursor)
+            
+            if page is None:
+                await query.edit_message_text(
+                    "📭 Nenhuma notícia nesta página.",
+                    reply_markup=InlineKeyboardMarkup([
+                        [InlineKeyboardButton("📋 Menu", callback_data="menu_main")]
+                    ])
+                )
+                return
+            
+            text, inline_keyboard = page
+            await query.edit_message_text(text, reply_markup=inline_keyboard, disable_web_page_preview=True)
+            
+        except Exception as e:
+            logger.error(f"Error in news_page_callback: {e}")
+            await query.edit_message_text("❌ Erro ao carregar a página. Tente novamente.")
+    
     async def category_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /category - Menu para filtrar por categoria"""
         await update.message.reply_text("📋 Selecione uma categoria:", reply_markup=self.category_keyboard)
@@ -342,10 +441,10 @@ Digite /help para ver todos os comandos disponíveis."""
         
         try:
             if category == "all":
-                news_list = self.db.get_unsent_news(limit=10)
+                news_list = await self.adb.get_unsent_news(limit=10)
                 category_name = "todas as categorias"
             else:
-                news_list = self.db.get_news_by_category(category, limit=10)
+                news_list = await self.adb.get_news_by_category(category, limit=10)
                 category_name = category
             
             if not news_list:
@@ -357,10 +456,12 @@ Digite /help para ver todos os comandos disponíveis."""
             await query.edit_message_text(f"📰 {total_count} notícias encontradas na categoria: {category_name.title()}\n\nEnviando cada notícia separadamente...")
             
             # Envia cada notícia em mensagem separada
+            # Corpo das notícias carregado só agora, para as que serão exibidas
+            bodies = await self.adb.get_news_bodies(news[0] for news in news_list[:10])
             for i, news in enumerate(news_list[:10], 1):
                 try:
                     title = news[1]
-                    content = news[2] if news[2] else ""
+                    content = bodies.get(news[0], "")
                     source = news[4]
                     url = news[3]
                     published_date = news[6] if len(news) > 6 and news[6] else "Data não disponível"
@@ -425,13 +526,14 @@ Digite /help para ver todos os comandos disponíveis."""
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /stats - Estatísticas do bot"""
         try:
-            stats = self.db.get_stats()
+            stats = await self.adb.get_stats()
             
             message = "📊 Estatísticas do Bot:\n\n"
             message += f"📰 Total de notícias: {stats.get('total_news', 0)}\n"
-            message += f"📭 Notícias não enviadas: {stats.get('unsent_news', 0)}\n\n"
+            message += f"📭 Notícias não enviadas: {stats.get('unsent', 0)}\n"
+            message += f"👁️ Notícias não visualizadas: {stats.get('unviewed', 0)}\n\n"
             
-            category_stats = stats.get('category_stats', {})
+            category_stats = stats.get('categories', {})
             if category_stats:
                 message += "📋 Por categoria:\n"
                 for category, count in category_stats.items():
@@ -441,6 +543,20 @@ Digite /help para ver todos os comandos disponíveis."""
             message += "\n🔧 Status das fontes:\n"
             message += "✅ Fontes oficiais de segurança\n"
             message += "✅ Scraping tradicional\n"
+            
+            jobs = job_metrics.snapshot()
+            if jobs:
+                message += "\n⏰ Tarefas agendadas:\n"
+                for job in jobs:
+                    message += f"   • {job['name']}: {job['runs']} execuções"
+                    if job['running']:
+                        message += " (🔄 rodando)"
+                    if job['runs']:
+                        message += f", última {job['last_started_at'].strftime('%d/%m %H:%M')} ({job['last_duration']:.1f}s)"
+                        message += f", média {job['avg_duration']:.1f}s, máx {job['max_duration']:.1f}s"
+                    if job['failures'] or job['skipped']:
+                        message += f", {job['failures']} falhas, {job['skipped']} puladas"
+                    message += "\n"
             message += f"\n🕐 Última atualização: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
             
             await update.message.reply_text(message, reply_markup=self.reply_keyboard)
@@ -449,6 +565,29 @@ Digite /help para ver todos os comandos disponíveis."""
             logger.error(f"Error in stats_command: {e}")
             await update.message.reply_text("❌ Erro ao buscar estatísticas.", reply_markup=self.reply_keyboard)
     
+    async def rebuild_stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Comando /rebuild_stats - Recalcula os contadores das estatísticas e mostra as divergências"""
+        try:
+            await update.message.reply_text("🔧 Recalculando contadores das estatísticas...")
+            mismatches = await self.adb.rebuild_counters()
+            
+            if mismatches is None:
+                message = "❌ Erro ao recalcular os contadores."
+            elif not mismatches:
+                message = "✅ Contadores consistentes: nenhuma divergência encontrada."
+            else:
+                message = f"⚠️ {len(mismatches)} contadores corrigidos:\n"
+                for (scope, key), (old, new) in sorted(mismatches.items())[:20]:
+                    label = f"{scope}:{key}" if key else scope
+                    message += f"   • {label}: {old} → {new}\n"
+            
+            await update.message.reply_text(message, reply_markup=self.reply_keyboard)
+            await self.adb.log_activity("Rebuild stats", f"Mismatches: {len(mismatches or {})}")
+            
+        except Exception as e:
+            logger.error(f"Error in rebuild_stats_command: {e}")
+            await update.message.reply_text("❌ Erro ao recalcular estatísticas.", reply_markup=self.reply_keyboard)
+    
     
     
     async def refresh_all_sources_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -460,31 +599,15 @@ Digite /help para ver todos os comandos disponíveis."""
             else:
                 await update.message.reply_text("🔄 Buscando notícias em todas as fontes...\n\n🚀 Fontes Oficiais de Segurança", reply_markup=self.reply_keyboard)
             
-            total_found = 0
-            total_saved = 0
-            
-            
-            # 2. Busca via scraping robusto (Fontes oficiais)
-            try:
-                robust_found, robust_saved = await self.scrape_all_news_robust()
-                total_found += robust_found
-                total_saved += robust_saved
-                logger.info(f"Scraping Robusto: {robust_found} encontradas, {robust_saved} salvas")
-            except Exception as e:
-                logger.error(f"Erro no Scraping Robusto: {e}")
-            
-            # 3. Busca via scraping tradicional (fallback)
-            try:
-                traditional_list = self.scraper.scrape_all_sources()
-                if traditional_list:
-                    saved_traditional = self.scraper.save_news_to_db(traditional_list)
-                    total_found += len(traditional_list)
-                    total_saved += saved_traditional
-                    logger.info(f"Tradicional: {len(traditional_list)} encontradas, {saved_traditional} salvas")
-            except Exception as e:
-                logger.error(f"Erro Scraping Tradicional: {e}")
+            result = await self.scrape_coordinator.refresh()
+            total_found, total_saved = result.found, result.saved
             
             message = f"✅ Busca completa concluída!\n\n"
+            if result.status == 'joined':
+                message += "⏳ Uma busca já estava em andamento; este é o resultado dela.\n\n"
+            elif result.status == 'cached':
+                age_minutes = max(1, round((datetime.now().timestamp() - result.finished_at) / 60))
+                message += f"♻️ Resultado da busca feita há {age_minutes} min.\n\n"
             message += f"📊 Total encontrado: {total_found} notícias\n"
             message += f"💾 Total salvo: {total_saved} novas notícias\n\n"
             message += "Use '📋 MENU' para ver as últimas notícias."
@@ -495,7 +618,7 @@ Digite /help para ver todos os comandos disponíveis."""
             else:
                 await update.message.reply_text(message, reply_markup=self.reply_keyboard)
             
-            self.db.log_activity("Manual refresh (All Sources)", f"Found: {total_found}, Saved: {total_saved}")
+            await self.adb.log_activity("Manual refresh (All Sources)", f"Found: {total_found}, Saved: {total_saved}")
             
         except Exception as e:
             logger.error(f"Error in refresh_all_sources_command: {e}")
@@ -511,59 +634,37 @@ Digite /help para ver todos os comandos disponíveis."""
         try:
             logger.info("🔄 Iniciando atualização automática de notícias...")
             
-            total_found = 0
-            total_saved = 0
-            
-            # 1. Busca via scraping robusto (Fontes oficiais)
-            try:
-                robust_count = await self.scrape_all_news_robust()
-                total_saved += robust_count
-                logger.info(f"Scraping Robusto (Auto): {robust_count} novas notícias salvas")
-            except Exception as e:
-                logger.error(f"Erro no Scraping Robusto (Auto): {e}")
-            
-            # 2. Busca via scraping tradicional (fallback)
-            try:
-                traditional_list = self.scraper.scrape_all_sources()
-                if traditional_list:
-                    saved_traditional = self.scraper.save_news_to_db(traditional_list)
-                    total_found += len(traditional_list)
-                    total_saved += saved_traditional
-                    logger.info(f"Tradicional (Auto): {len(traditional_list)} encontradas, {saved_traditional} salvas")
-            except Exception as e:
-                logger.error(f"Erro Scraping Tradicional (Auto): {e}")
+            # Atualização agendada ignora a janela de frescor, mas reaproveita um ciclo em andamento
+            result = await self.scrape_coordinator.refresh(force=True)
+            total_found, total_saved = result.found, result.saved
             
             # Log da atividade
-            self.db.log_activity("Auto refresh (60min)", f"Found: {total_found}, Saved: {total_saved}")
+            await self.adb.log_activity(f"Auto refresh ({UPDATE_INTERVAL}min)", f"Found: {total_found}, Saved: {total_saved}")
             
             # Notifica todos os usuários ativos se há novas notícias
             if total_saved > 0:
                 try:
-                    active_users = self.db.get_active_users()
+                    active_users = await self.adb.get_active_users()
                     logger.info(f"Enviando notificações para {len(active_users)} usuários ativos")
                     
                     message = f"🔔 **Novas Notícias Disponíveis!**\n\n"
                     message += f"📊 **{total_saved} novas notícias** encontradas!\n"
-                    message += f"📰 Total de notícias no banco: {self.db.get_total_news_count()}\n\n"
+                    total_news = await self.adb.get_total_news_count()
+                    message += f"📰 Total de notícias no banco: {total_news}\n\n"
                     message += "Use '📋 MENU' → '📰 Últimas Notícias' para ver as novidades!"
                     
-                    notifications_sent = 0
-                    for user_id, username, first_name, last_name in active_users:
-                        try:
-                            await self.application.bot.send_message(
-                                chat_id=user_id,
-                                text=message,
-                                parse_mode='Markdown'
-                            )
-                            notifications_sent += 1
-                        except Exception as e:
-                            logger.warning(f"Erro ao enviar notificação para usuário {user_id}: {e}")
-                            # Se o usuário bloqueou o bot, desativa as notificações
-                            if "bot was blocked" in str(e).lower() or "chat not found" in str(e).lower():
-                                self.db.deactivate_user(user_id)
-                                logger.info(f"Usuário {user_id} desativado (bot bloqueado)")
-                    
-                    logger.info(f"✅ {notifications_sent} notificações enviadas com sucesso")
+                    # Uma chave por ciclo de scraping: o mesmo resultado nunca é notificado duas vezes
+                    queued = await self.outbox.enqueue([
+                        {
+                            'chat_id': user_id,
+                            'idempotency_key': f"new_news:{result.finished_at:.3f}:{user_id}",
+                            'text': message,
+                            'parse_mode': 'Markdown'
+                        }
+                        for user_id, username, first_name, last_name in active_users
+                    ])
+                    logger.info(f"✅ {queued} notificações enfileiradas")
+                    await self.adb.log_activity("Broadcast", f"Queued: {queued}/{len(active_users)}")
                     
                 except Exception as e:
                     logger.error(f"Erro ao enviar notificações automáticas: {e}")
@@ -587,33 +688,68 @@ Digite /help para ver todos os comandos disponíveis."""
             logger.error(f"Erro no callback de notícias visualizadas: {e}")
             await query.edit_message_text("❌ Erro ao processar solicitação. Tente novamente.")
     
-    def run_auto_refresh(self):
-        """Executa a atualização automática em uma thread separada"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.auto_refresh_news())
-        except Exception as e:
-            logger.error(f"Erro ao executar auto_refresh: {e}")
+    async def auto_refresh_job(self, context: ContextTypes.DEFAULT_TYPE):
+        """Tarefa agendada de atualização automática (JobQueue)"""
+        async with job_metrics.track(context.job.name):
+            await self.auto_refresh_news()
+    
+    async def cleanup_job(self, context: ContextTypes.DEFAULT_TYPE):
+        """Tarefa agendada de retenção e manutenção do banco (JobQueue)"""
+        async with job_metrics.track(context.job.name):
+            report = await self.run_blocking(self.retention.run)
+            details = ", ".join(f"{table}: {deleted}" for table, deleted in report.items())
+            await self.adb.log_activity("Retention cleanup", f"Deleted - {details}")
     
-    def start_scheduler(self):
-        """Inicia o scheduler para atualização automática a cada 60 minutos"""
-        logger.info("⏰ Configurando atualização automática a cada 60 minutos...")
+    def setup_jobs(self, application):
+        """Agenda as tarefas periódicas no JobQueue (event loop da própria aplicação)"""
+        job_queue = application.job_queue
+        if job_queue is None:
+            logger.error("❌ JobQueue indisponível! Instale python-telegram-bot[job-queue]")
+            return
         
-        # Agenda a execução a cada 60 minutos
-        schedule.every(60).minutes.do(self.run_auto_refresh)
+        # Nunca duas execuções da mesma tarefa ao mesmo tempo; atrasos acumulados viram uma só
+        job_kwargs = {
+            'max_instances': 1,
+            'coalesce': True,
+            'jitter': JOB_JITTER_SECONDS,
+            'misfire_grace_time': max(JOB_JITTER_SECONDS * 2, 60)
+        }
         
-        def run_scheduler():
-            """Executa o scheduler em uma thread separada"""
-            while True:
-                schedule.run_pending()
-                threading.Event().wait(60)  # Verifica a cada minuto
+        logger.info(f"⏰ Configurando atualização automática a cada {UPDATE_INTERVAL} minutos...")
+        job_queue.run_repeating(
+            self.auto_refresh_job,
+            interval=UPDATE_INTERVAL * 60,
+            first=UPDATE_INTERVAL * 60,
+            name="auto_refresh",
+            job_kwargs=job_kwargs
+        )
+        job_queue.run_repeating(
+            self.cleanup_job,
+            interval=CLEANUP_INTERVAL * 60,
+            first=CLEANUP_INTERVAL * 60,
+            name="cleanup",
+            job_kwargs=job_kwargs
+        )
         
-        # Inicia o scheduler em uma thread separada
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
+        def on_max_instances(event):
+            job = job_queue.scheduler.get_job(event.job_id)
+            job_metrics.record_skipped(job.name if job else event.job_id)
         
-        logger.info("✅ Scheduler iniciado - Atualização automática ativa!")
+        job_queue.scheduler.add_listener(on_max_instances, EVENT_JOB_MAX_INSTANCES)
+        logger.info("✅ Tarefas agendadas - Atualização automática ativa!")
+    
+    async def startup(self, application):
+        """Inicia os serviços em segundo plano (post_init, no event loop da aplicação)"""
+        await self.outbox.start()
+    
+    async def shutdown(self, application):
+        """Libera os recursos do bot (post_shutdown, depois que o JobQueue parou)"""
+        await self.outbox.stop()
+        self.scrape_executor.shutdown(wait=True, cancel_futures=True)
+        self.scraper.close()
+        self.adb.shutdown()
+        self.db.close()
+        logger.info("👋 Bot finalizado")
     
     async def menu_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando do menu principal com opções simplificadas"""
@@ -636,7 +772,7 @@ Escolha uma das opções abaixo:
             await query.answer()
             
             # Busca notícias que já foram enviadas
-            sent_news = self.db.get_sent_news(limit=10)
+            sent_news = await self.adb.get_sent_news(limit=10)
             
             if not sent_news:
                 await query.edit_message_text("📭 Nenhuma notícia foi apresentada ainda. Use '🔄 BUSCAR NOTÍCIAS' primeiro.")
@@ -647,10 +783,12 @@ Escolha uma das opções abaixo:
             await query.edit_message_text(f"📋 **{total_count} Notícias Apresentadas**\n\nEnviando cada notícia...", parse_mode='Markdown')
             
             # Envia cada notícia em mensagem separada
+            # Corpo das notícias carregado só agora, para as que serão exibidas
+            bodies = await self.adb.get_news_bodies(news[0] for news in sent_news[:10])
             for i, news in enumerate(sent_news[:10], 1):
                 try:
                     title = news[1]
-                    content = news[2] if news[2] else ""
+                    content = bodies.get(news[0], "")
                     source = news[4]
                     url = news[3]
                     category = news[5] if news[5] else "Geral"
@@ -776,24 +914,9 @@ Escolha uma das opções abaixo:
         query = update.callback_query
         await query.answer()
         
-        # Mapeamento de fontes para nomes no banco de dados
-        source_names = {
-            "prf": "PRF Nacional",
-            "pf": "PF Nacional",
-            "pc_rs": "PC RS",
-            "bm_rs": "BM RS",
-            "pc_sc": "PC SC",
-            "pm_sc": "PM SC",
-            "pc_pr": "PC PR",
-            "pm_pr": "PM PR",
-            "dof_ms": "DOF MS",
-            "mp_rs": "MP RS",
-            "all": "Todas as Fontes"
-        }
-        
         try:
             source = query.data.replace("source_", "")
-            source_name = source_names.get(source, source.title())
+            source_name = self.source_names.get(source, source.title())
             
             if source == "all":
                 await self.show_all_sources_news(update, context)
@@ -807,12 +930,12 @@ Escolha uma das opções abaixo:
     async def show_source_news(self, update: Update, context: ContextTypes.DEFAULT_TYPE, source: str, source_name: str):
         """Mostra notícias de uma fonte específica"""
         try:
-            # Busca notícias da fonte específica (todas, incluindo visualizadas)
-            news_list = self.db.get_news_by_source(source_name)
+            # Primeira página da fonte (todas, incluindo visualizadas)
+            page = await self._build_news_page('s', source)
             
-            if not news_list:
+            if page is None:
                 # Mostra fontes disponíveis quando não há notícias
-                available_sources = self._get_available_sources()
+                available_sources = await self._get_available_sources()
                 message = f"📰 **{source_name}**\n\n"
                 message += "❌ Nenhuma notícia encontrada desta fonte.\n\n"
                 message += "📊 **Fontes com notícias disponíveis:**\n"
@@ -829,93 +952,9 @@ Escolha uma das opções abaixo:
                 )
                 return
             
-            # Mensagem inicial
-            total_news = len(news_list)
-            message = f"📰 **{source_name}**\n\n"
-            message += f"📊 **{total_news} notícias encontradas**\n"
-            message += f"🔍 Mostrando todas as notícias (incluindo visualizadas)\n\n"
-            
-            await update.callback_query.edit_message_text(
-                message,
-                parse_mode='Markdown'
-            )
-            
-            # Envia cada notícia
-            for i, news in enumerate(news_list[:15], 1):  # Limita a 15 notícias
-                try:
-                    title = news[1]
-                    content = news[2] if news[2] else ""
-                    source = news[4]
-                    category = news[5] if news[5] else "Geral"
-                    url = news[3]
-                    published_date = news[6] if len(news) > 6 and news[6] else "Data não disponível"
-                    viewed = news[9] if len(news) > 9 else False  # Campo viewed
-                    
-                    category_emoji = {
-                        'drogas': '🚨',
-                        'armas': '🔫',
-                        'tráfico': '🚨',
-                        'facções': '👥'
-                    }.get(category, '📰')
-                    
-                    # Emoji de status de visualização
-                    view_status = "👁️" if viewed else "🆕"
-                    
-                    # Formata a data se disponível
-                    formatted_date = ""
-                    if published_date and published_date != "Data não disponível":
-                        try:
-                            if 'T' in published_date:
-                                dt = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
-                                formatted_date = f"📅 {dt.strftime('%d/%m/%Y %H:%M')}\n"
-                        except (ValueError, TypeError):
-                            formatted_date = f"📅 {published_date}\n"
-                    
-                    # Cria mensagem para a notícia
-                    source_emoji = self.get_source_emoji(source)
-                    clean_source = source.replace("Scraping Robusto - ", "")
-                    message = f"{view_status} {source_emoji} {clean_source}\n\n"
-                    
-                    # Adiciona resumo (usa título se não há conteúdo)
-                    if content and len(content.strip()) > 10:
-                        if len(content) > 600:
-                            content = content[:600] + "..."
-                        message += f"📝 Resumo:\n{content}\n\n"
-                    else:
-                        # Usa o título como resumo se não há conteúdo
-                        message += f"📝 Resumo:\n{title}\n\n"
-                    
-                    # Informações da notícia
-                    message += f"🏷️ Categoria: {category.title()}\n"
-                    message += formatted_date
-                    message += f"🔗 {url}"
-                    
-                    # Envia a notícia
-                    await context.bot.send_message(
-                        chat_id=update.callback_query.message.chat_id,
-                        text=message,
-                        disable_web_page_preview=True
-                    )
-                    
-                    # Pequena pausa entre mensagens
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao enviar notícia {i} da fonte {source_name}: {e}")
-                    continue
-            
-            # Mensagem final
-            final_msg = f"✅ **Concluído!**\n\n"
-            final_msg += f"📊 Mostradas {min(total_news, 15)} de {total_news} notícias de **{source_name}**\n\n"
-            final_msg += "Use '☑️ Notícias Visualizadas' para ver outras fontes."
-            
-            await context.bot.send_message(
-                chat_id=update.callback_query.message.chat_id,
-                text=final_msg,
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("☑️ Ver Outras Fontes", callback_data="menu_viewed")]
-                ])
-            )
+            # Uma única mensagem com a primeira página
+            text, inline_keyboard = page
+            await update.callback_query.edit_message_text(text, reply_markup=inline_keyboard, disable_web_page_preview=True)
             
         except Exception as e:
             logger.error(f"Error in show_source_news: {e}")
@@ -924,10 +963,10 @@ Escolha uma das opções abaixo:
     async def show_all_sources_news(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mostra notícias de todas as fontes"""
         try:
-            # Busca todas as notícias
-            news_list = self.db.get_all_news(limit=20)
+            # Primeira página de todas as fontes
+            page = await self._build_news_page('a')
             
-            if not news_list:
+            if page is None:
                 message = "📰 **Todas as Fontes**\n\n"
                 message += "❌ Nenhuma notícia encontrada.\n\n"
                 message += "Use '🔄 Atualizar Notícias' para buscar novas notícias."
@@ -941,92 +980,9 @@ Escolha uma das opções abaixo:
                 )
                 return
             
-            # Mensagem inicial
-            total_news = len(news_list)
-            message = f"📰 **Todas as Fontes**\n\n"
-            message += f"📊 **{total_news} notícias mais recentes**\n"
-            message += f"🔍 Mostrando de todas as fontes\n\n"
-            
-            await update.callback_query.edit_message_text(
-                message,
-                parse_mode='Markdown'
-            )
-            
-            # Envia cada notícia (similar ao show_source_news)
-            for i, news in enumerate(news_list, 1):
-                try:
-                    title = news[1]
-                    content = news[2] if news[2] else ""
-                    source = news[4]
-                    category = news[5] if news[5] else "Geral"
-                    url = news[3]
-                    published_date = news[6] if len(news) > 6 and news[6] else "Data não disponível"
-                    viewed = news[9] if len(news) > 9 else False
-                    
-                    category_emoji = {
-                        'drogas': '🚨',
-                        'armas': '🔫',
-                        'tráfico': '🚨',
-                        'facções': '👥'
-                    }.get(category, '📰')
-                    
-                    view_status = "👁️" if viewed else "🆕"
-                    
-                    # Formata a data se disponível
-                    formatted_date = ""
-                    if published_date and published_date != "Data não disponível":
-                        try:
-                            if 'T' in published_date:
-                                dt = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
-                                formatted_date = f"📅 {dt.strftime('%d/%m/%Y %H:%M')}\n"
-                        except (ValueError, TypeError):
-                            formatted_date = f"📅 {published_date}\n"
-                    
-                    # Cria mensagem para a notícia
-                    source_emoji = self.get_source_emoji(source)
-                    clean_source = source.replace("Scraping Robusto - ", "")
-                    message = f"{view_status} {source_emoji} {clean_source}\n\n"
-                    
-                    # Adiciona resumo (usa título se não há conteúdo)
-                    if content and len(content.strip()) > 10:
-                        if len(content) > 600:
-                            content = content[:600] + "..."
-                        message += f"📝 Resumo:\n{content}\n\n"
-                    else:
-                        # Usa o título como resumo se não há conteúdo
-                        message += f"📝 Resumo:\n{title}\n\n"
-                    
-                    # Informações da notícia
-                    message += f"🏷️ Categoria: {category.title()}\n"
-                    message += formatted_date
-                    message += f"🔗 {url}"
-                    
-                    # Envia a notícia
-                    await context.bot.send_message(
-                        chat_id=update.callback_query.message.chat_id,
-                        text=message,
-                        disable_web_page_preview=True
-                    )
-                    
-                    # Pequena pausa entre mensagens
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao enviar notícia {i} de todas as fontes: {e}")
-                    continue
-            
-            # Mensagem final
-            final_msg = f"✅ **Concluído!**\n\n"
-            final_msg += f"📊 Mostradas {total_news} notícias de **todas as fontes**\n\n"
-            final_msg += "Use '📡 Fontes' para ver fontes específicas."
-            
-            await context.bot.send_message(
-                chat_id=update.callback_query.message.chat_id,
-                text=final_msg,
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("☑️ Ver Fontes Específicas", callback_data="menu_viewed")]
-                ])
-            )
+            # Uma única mensagem com a primeira página
+            text, inline_keyboard = page
+            await update.callback_query.edit_message_text(text, reply_markup=inline_keyboard, disable_web_page_preview=True)
             
         except Exception as e:
             logger.error(f"Error in show_all_sources_news: {e}")
@@ -1042,16 +998,22 @@ Escolha uma das opções abaixo:
             news_id = int(query.data.replace("mark_read_", ""))
             
             # Marca a notícia como visualizada
-            success = self.db.mark_as_viewed(news_id)
+            success = await self.adb.mark_as_viewed(news_id)
             
             if success:
-                # Atualiza o botão para mostrar que foi marcada
-                new_keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("✅ Lida", callback_data="already_read")]
-                ])
+                # Troca apenas o botão pressionado; o restante da página continua igual
+                new_keyboard = []
+                for row in query.message.reply_markup.inline_keyboard:
+                    new_row = []
+                    for button in row:
+                        if button.callback_data == query.data:
+                            label = "✅ Lida" if button.text == "✅ Marcar como Lida" else button.text.replace("✅", "☑️")
+                            button = InlineKeyboardButton(label, callback_data="already_read")
+                        new_row.append(button)
+                    new_keyboard.append(new_row)
                 
                 # Atualiza a mensagem com o novo botão
-                await query.edit_message_reply_markup(reply_markup=new_keyboard)
+                await query.edit_message_reply_markup(reply_markup=InlineKeyboardMarkup(new_keyboard))
             else:
                 await context.bot.send_message(
                     chat_id=query.message.chat_id,
@@ -1073,7 +1035,7 @@ Escolha uma das opções abaixo:
     async def show_viewed_news_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mostra menu de notícias visualizadas com opções de fontes"""
         try:
-            stats = self.db.get_view_stats()
+            stats = await self.adb.get_view_stats()
             
             message = "☑️ **Notícias Visualizadas**\n\n"
             message += f"📊 **Estatísticas:**\n"
@@ -1107,8 +1069,8 @@ Escolha uma das opções abaixo:
     async def show_viewed_news(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mostra notícias já visualizadas"""
         try:
-            news_list = self.db.get_viewed_news(limit=10)
-            stats = self.db.get_view_stats()
+            news_list = await self.adb.get_viewed_news(limit=10)
+            stats = await self.adb.get_view_stats()
             
             if not news_list:
                 message = "👁️ **Nenhuma notícia visualizada ainda.**\n\n"
@@ -1133,10 +1095,12 @@ Escolha uma das opções abaixo:
                 await update.callback_query.edit_message_text(stats_message, parse_mode='Markdown')
             
             # Envia cada notícia visualizada
+            # Corpo das notícias carregado só agora, para as que serão exibidas
+            bodies = await self.adb.get_news_bodies(news[0] for news in news_list[:10])
             for i, news in enumerate(news_list[:10], 1):
                 try:
                     title = news[1]
-                    content = news[2] if news[2] else ""
+                    content = bodies.get(news[0], "")
                     source = news[4]
                     category = news[5] if news[5] else "Geral"
                     url = news[3]
@@ -1232,13 +1196,13 @@ Escolha uma das opções abaixo:
             message += "\n🤖 **Configurações do Bot:**\n"
             message += f"📱 Chat ID: {TELEGRAM_CHAT_ID}\n"
             message += f"🗄️ Banco de dados: news_bot.db\n"
-            message += f"🔄 Intervalo de busca: 30 minutos\n"
+            message += f"🔄 Intervalo de busca: {UPDATE_INTERVAL} minutos\n"
             
             # Estatísticas de uso
-            stats = self.db.get_stats()
+            stats = await self.adb.get_stats()
             message += "\n📊 **Estatísticas de Uso:**\n"
             message += f"📰 Total de notícias: {stats.get('total_news', 0)}\n"
-            message += f"📭 Notícias pendentes: {stats.get('unsent_news', 0)}\n"
+            message += f"📭 Notícias pendentes: {stats.get('unsent', 0)}\n"
             
             message += f"\n🕐 **Última atualização:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
             
@@ -1266,6 +1230,7 @@ Escolha uma das opções abaixo:
         application.add_handler(CommandHandler("latest", self.latest_command))
         application.add_handler(CommandHandler("category", self.category_command))
         application.add_handler(CommandHandler("stats", self.stats_command))
+        application.add_handler(CommandHandler("rebuild_stats", self.rebuild_stats_command))
         application.add_handler(CommandHandler("refresh_all", self.refresh_all_sources_command))
         
         # Callback query handlers
@@ -1274,6 +1239,7 @@ Escolha uma das opções abaixo:
         application.add_handler(CallbackQueryHandler(self.source_callback, pattern=r'^source_'))
         application.add_handler(CallbackQueryHandler(self.mark_read_callback, pattern=r'^mark_read_'))
         application.add_handler(CallbackQueryHandler(self.already_read_callback, pattern=r'^already_read$'))
+        application.add_handler(CallbackQueryHandler(self.news_page_callback, pattern=r'^pg\|'))
         
         # Message handler para botões fixos
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_text_message))
@@ -1308,21 +1274,29 @@ def main():
     bot = NewsBot()
     
     # Configura a aplicação
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .post_init(bot.startup)
+        .post_shutdown(bot.shutdown)
+        .build()
+    )
     
     # Configura os handlers
     bot.setup_handlers(application)
     
-    # Define a aplicação no bot para usar no scheduler
+    # Define a aplicação no bot para usar nas tarefas agendadas
     bot.application = application
+    bot.broadcaster = Broadcaster(application.bot)
+    bot.outbox = OutboxDispatcher(bot.adb, bot.broadcaster)
     
     logger.info("🤖 Bot iniciado com sucesso!")
     logger.info("📱 Use /start no Telegram para começar a usar o bot")
     
     logger.info("✅ Bot iniciado com fontes oficiais de segurança")
     
-    # Inicia o scheduler para atualização automática
-    bot.start_scheduler()
+    # Agenda a atualização automática e a manutenção no JobQueue
+    bot.setup_jobs(application)
     
     # Inicia o bot
     application.run_polling()
@@ -0,0 +1,117 @@
+"""
+Envio de mensagens respeitando os limites do Telegram
+Cada envio passa por um token bucket global (limite de ~30 mensagens/s) e
+no máximo 1 mensagem/s por chat. Um RetryAfter pausa todos os envios pelo
+tempo pedido pelo servidor. Usado pelo OutboxDispatcher, que drena a fila
+e desativa os usuários que bloquearam o bot.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from rate_limiter import TokenBucket
+from config import BROADCAST_RATE_PER_SECOND, BROADCAST_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Resultados possíveis de um envio
+SENT = 'sent'
+BLOCKED = 'blocked'
+FAILED = 'failed'  # Erro permanente (ex.: mensagem inválida)
+RETRY = 'retry'  # Erro temporário que persistiu após as novas tentativas
+
+# Erros de BadRequest que significam que o chat não existe mais para o bot
+_GONE_CHAT_ERRORS = ('chat not found', 'user is deactivated', 'bot was blocked')
+
+# Segundos sem envios após os quais o balde de um chat é descartado (já estaria cheio)
+_CHAT_BUCKET_IDLE = 300
+
+
+class Broadcaster:
+    """Envio de mensagens com limite global e por chat, usando o bot da aplicação"""
+
+    def __init__(self, bot, rate=BROADCAST_RATE_PER_SECOND, max_retries=BROADCAST_MAX_RETRIES):
+        self.bot = bot
+        self.max_retries = max_retries
+        self._global_bucket = TokenBucket(1.0 / rate, burst=1)
+        self._chat_buckets = {}
+        self._paused_until = 0.0  # time.monotonic() até quando um RetryAfter suspende os envios
+        self._last_eviction = time.monotonic()
+
+    def _chat_bucket(self, chat_id):
+        """Balde do chat; baldes ociosos (já cheios de novo) são descartados periodicamente"""
+        now = time.monotonic()
+        if now - self._last_eviction > _CHAT_BUCKET_IDLE:
+            self._chat_buckets = {
+                chat: bucket for chat, bucket in self._chat_buckets.items()
+                if now - bucket.updated_at <= _CHAT_BUCKET_IDLE
+            }
+            self._last_eviction = now
+
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(1.0, burst=1)
+        return bucket
+
+    async def _wait_turn(self, chat_id):
+        """Aguarda a pausa de flood, o orçamento do chat e o orçamento global"""
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            wait_time = max(self._chat_bucket(chat_id).reserve(), self._global_bucket.reserve())
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+            # Um RetryAfter que chegou durante a espera invalida a vaga reservada: aguarda e reserva outra
+            if self._paused_until <= time.monotonic():
+                return
+
+    def _pause(self, retry_after):
+        """Suspende todos os envios pelo tempo pedido pelo Telegram"""
+        if isinstance(retry_after, timedelta):
+            retry_after = retry_after.total_seconds()
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        return retry_after
+
+    async def deliver(self, chat_id, text, **kwargs):
+        """
+        Envia uma mensagem respeitando os limites e retorna (resultado, erro)
+        resultado é SENT, BLOCKED, FAILED ou RETRY; erro é a última mensagem de erro
+        RetryAfter e falhas de rede são repetidos até max_retries vezes
+        """
+        error = None
+        for attempt in range(self.max_retries + 1):
+            await self._wait_turn(chat_id)
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                return SENT, None
+
+            except RetryAfter as e:
+                error = str(e)
+                delay = self._pause(e.retry_after)
+                logger.warning(f"⏳ Flood control do Telegram: pausando envios por {delay:.0f}s")
+
+            except Forbidden as e:
+                logger.info(f"Usuário {chat_id} bloqueou o bot: {e}")
+                return BLOCKED, str(e)
+
+            except BadRequest as e:
+                if any(gone in str(e).lower() for gone in _GONE_CHAT_ERRORS):
+                    logger.info(f"Chat {chat_id} indisponível: {e}")
+                    return BLOCKED, str(e)
+                logger.warning(f"Erro ao enviar mensagem para {chat_id}: {e}")
+                return FAILED, str(e)
+
+            except NetworkError as e:
+                error = str(e)
+                logger.warning(f"Erro de rede ao enviar para {chat_id} (tentativa {attempt + 1}): {e}")
+                await asyncio.sleep(2 ** attempt)
+
+        logger.warning(f"Desistindo de enviar para {chat_id} após {self.max_retries + 1} tentativas")
+        return RETRY, error
@@ -11,6 +11,17 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')  # Chat onde o bot enviará as
 
 # Database Configuration
 DATABASE_PATH = 'news_bot.db'
+DATABASE_CACHE_SIZE_KB = 16 * 1024  # Page cache por conexão
+DATABASE_MMAP_SIZE = 128 * 1024 * 1024  # I/O via mmap (bytes)
+DATABASE_BUSY_TIMEOUT_MS = 5000  # Espera máxima por um lock de escrita
+
+# Armazenamento do corpo das notícias
+# 'compressed': corpo comprimido na tabela news_body, lido só na hora de exibir
+# 'inline': corpo em texto puro na coluna news.content (formato antigo)
+NEWS_BODY_STORAGE = 'compressed'
+# 'zlib' (padrão, sempre disponível), 'zstd' ou 'auto' (zstd se instalado). zstandard não está
+# em requirements.txt: corpos gravados com zstd só podem ser lidos onde o pacote estiver instalado
+NEWS_BODY_CODEC = 'zlib'
 
 # Search Configuration
 SEARCH_KEYWORDS = [
@@ -65,6 +76,64 @@ PORTAL_URLS = {
     ]
 }
 
+# Rate limiting por portal (token bucket por host)
+# rate_limit: segundos entre requisições ao mesmo host; burst: requisições liberadas de imediato
+PORTAL_RATE_LIMITS = {
+    'PRF': {'rate_limit': 0.5, 'burst': 3},
+    'PF': {'rate_limit': 0.5, 'burst': 3},
+    'Brigada_Militar': {'rate_limit': 0.5, 'burst': 3},
+    'Policia_Civil': {'rate_limit': 0.3, 'burst': 3},
+    'Policia_Civil_SC': {'rate_limit': 0.5, 'burst': 3},
+    'Policia_Civil_PR': {'rate_limit': 0.5, 'burst': 3}
+}
+
+# Extração do conteúdo dos artigos (pool de threads)
+ARTICLE_FETCH_WORKERS = 16  # Downloads de artigos simultâneos no total
+ARTICLE_FETCH_PER_HOST = 8  # Downloads simultâneos por host
+# Orçamento próprio dos artigos por host (separado do das páginas de listagem)
+ARTICLE_FETCH_RATE_LIMIT = 0.1  # segundos entre downloads de artigos no mesmo host
+ARTICLE_FETCH_BURST = 8  # downloads liberados de imediato
+
+# Executor do bot para trabalho bloqueante (scraping tradicional e gravações no banco)
+SCRAPE_EXECUTOR_WORKERS = 2
+
+# Pool de threads das consultas dos handlers ao banco (cada thread tem sua conexão)
+DB_EXECUTOR_WORKERS = 2
+
+# Pedidos de atualização dentro desta janela (segundos) reaproveitam o último
+# scraping em vez de disparar um novo (0 desativa)
+REFRESH_FRESHNESS_WINDOW = 120
+
+# Notificações em massa (limites do Telegram: ~30 msg/s no total, 1 msg/s por chat)
+BROADCAST_RATE_PER_SECOND = 25
+BROADCAST_MAX_RETRIES = 3  # Novas tentativas após RetryAfter / erro de rede
+
+# Fila persistente de mensagens (outbox)
+OUTBOX_BATCH_SIZE = 20  # Mensagens por lote (no máximo uma por chat)
+OUTBOX_POLL_INTERVAL = 5  # Segundos entre verificações com a fila vazia
+OUTBOX_MAX_ATTEMPTS = 6  # Tentativas antes de desistir de uma mensagem
+OUTBOX_BACKOFF_BASE = 30  # Segundos de espera após a 1ª falha (dobra a cada falha)
+OUTBOX_BACKOFF_MAX = 30 * 60
+
+# Notícias por página nas listagens com botões ◀️/▶️
+NEWS_PAGE_SIZE = 5
+
 # Update intervals (in minutes)
-UPDATE_INTERVAL = 30  # Buscar notícias a cada 30 minutos
+UPDATE_INTERVAL = 60  # Buscar notícias a cada 60 minutos
 CLEANUP_INTERVAL = 24 * 60  # Limpar notícias antigas a cada 24 horas
+JOB_JITTER_SECONDS = 60  # Variação aleatória no horário das tarefas agendadas
+
+# Retenção de dados (tarefa de limpeza, a cada CLEANUP_INTERVAL)
+# max_age_days: remove registros mais antigos que isso
+# max_rows_per_source: mantém só as N notícias mais recentes de cada fonte
+# keep_unviewed: nunca remove notícias que ainda não foram visualizadas
+# Na outbox, só mensagens finalizadas (enviadas, com falha ou bloqueadas) são removidas
+RETENTION_POLICIES = {
+    'news': {'max_age_days': 180, 'max_rows_per_source': 5000, 'keep_unviewed': True},
+    'activity_log': {'max_age_days': 30},
+    'outbox': {'max_age_days': 7}
+}
+RETENTION_BATCH_SIZE = 500  # Registros por transação de remoção
+RETENTION_BATCH_PAUSE = 0.05  # Segundos entre lotes (libera o lock de escrita)
+RETENTION_ARCHIVE_DIR = 'archive'  # Registros removidos vão para <dir>/<tabela>/*.ndjson.gz (None desativa)
+RETENTION_VACUUM_PAGES = 1000  # Páginas devolvidas por passo do incremental_vacuum
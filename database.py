@@ -1,91 +1,417 @@
 import sqlite3
 import logging
+import threading
 from datetime import datetime
-from config import DATABASE_PATH
+from config import (DATABASE_PATH, DATABASE_CACHE_SIZE_KB, DATABASE_MMAP_SIZE, DATABASE_BUSY_TIMEOUT_MS,
+                    NEWS_BODY_STORAGE)
+from body_storage import compress_body, decompress_body
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _add_news_viewed_column(conn):
+    """Adiciona o campo 'viewed' em bancos criados antes dele existir"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(news)")]
+    if 'viewed' not in columns:
+        conn.execute("ALTER TABLE news ADD COLUMN viewed BOOLEAN DEFAULT FALSE")
+        logger.info("Campo 'viewed' adicionado à tabela news")
+
+
+def _counter_upsert(scope, key, delta, condition="1"):
+    """Comando de trigger que soma `delta` ao contador (scope, key) de news_counters"""
+    return f'''
+            INSERT INTO news_counters (scope, key, count)
+            SELECT '{scope}', {key}, {delta} WHERE {condition}
+            ON CONFLICT(scope, key) DO UPDATE SET count = count + excluded.count;'''
+
+
+def _flag(expression):
+    """1 se o campo booleano está marcado, 0 caso contrário (inclusive NULL)"""
+    return f"(COALESCE({expression}, 0) != 0)"
+
+
+def _counter_changes(row, sign):
+    """Contadores afetados por uma linha de news (NEW na inserção, OLD na remoção)"""
+    return "".join([
+        _counter_upsert('total', "''", sign),
+        _counter_upsert('viewed', "''", sign, _flag(f"{row}.viewed")),
+        _counter_upsert('sent', "''", sign, _flag(f"{row}.sent_to_telegram")),
+        _counter_upsert('category', f"{row}.category", sign, f"{row}.category IS NOT NULL"),
+        _counter_upsert('source', f"{row}.source", sign, f"{row}.source IS NOT NULL")
+    ])
+
+
+def _rebuild_news_counters(conn):
+    """Recalcula news_counters a partir da tabela news (backfill e checagem de consistência)"""
+    conn.execute("DELETE FROM news_counters")
+    conn.execute(f'''
+        INSERT INTO news_counters (scope, key, count)
+        SELECT 'total', '', COUNT(*) FROM news
+        UNION ALL
+        SELECT 'viewed', '', COUNT(*) FROM news WHERE {_flag("viewed")}
+        UNION ALL
+        SELECT 'sent', '', COUNT(*) FROM news WHERE {_flag("sent_to_telegram")}
+        UNION ALL
+        SELECT 'category', category, COUNT(*) FROM news WHERE category IS NOT NULL GROUP BY category
+        UNION ALL
+        SELECT 'source', source, COUNT(*) FROM news WHERE source IS NOT NULL GROUP BY source
+    ''')
+
+
+def _move_news_bodies(conn, chunk_size=1000):
+    """Move o conteúdo em texto de news.content para news_body, comprimido (modo 'compressed')"""
+    if NEWS_BODY_STORAGE != 'compressed':
+        return
+    
+    ids = [row[0] for row in conn.execute("SELECT id FROM news WHERE content IS NOT NULL")]
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        placeholders = ','.join('?' * len(chunk))
+        rows = conn.execute(f"SELECT id, content FROM news WHERE id IN ({placeholders})", chunk).fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO news_body (news_id, codec, body) VALUES (?, ?, ?)",
+            [(news_id, *compress_body(content)) for news_id, content in rows if content]
+        )
+        conn.execute(f"UPDATE news SET content = NULL WHERE id IN ({placeholders})", chunk)
+    
+    if ids:
+        logger.info(f"Moved {len(ids)} news bodies to compressed storage")
+
+
+# Migrações versionadas do schema (PRAGMA user_version)
+# Cada entrada: (versão, descrição, passos); os passos são comandos SQL ou
+# funções que recebem a conexão (novas colunas, backfills de dados).
+# As migrações são aplicadas uma única vez, em ordem; nunca altere uma
+# migração já publicada, acrescente uma nova no fim da lista.
+SCHEMA_MIGRATIONS = [
+    (1, "Tabelas iniciais", [
+        # Tabela para armazenar notícias
+        '''
+        CREATE TABLE IF NOT EXISTS news (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT,
+            url TEXT UNIQUE,
+            source TEXT NOT NULL,
+            category TEXT,
+            location TEXT,
+            published_date TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            sent_to_telegram BOOLEAN DEFAULT FALSE,
+            viewed BOOLEAN DEFAULT FALSE
+        )
+        ''',
+        _add_news_viewed_column,
+        # Tabela para configurações do bot
+        '''
+        CREATE TABLE IF NOT EXISTS bot_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Tabela para log de atividades
+        '''
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity TEXT NOT NULL,
+            details TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Tabela para usuários ativos (para notificações)
+        '''
+        CREATE TABLE IF NOT EXISTS active_users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT UNIQUE NOT NULL,
+            username TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            last_activity TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Tabela de validadores HTTP das páginas de listagem (requisições condicionais)
+        '''
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Tabela de impressões digitais das listagens (detecção de mudanças por fonte)
+        '''
+        CREATE TABLE IF NOT EXISTS listing_fingerprints (
+            url TEXT PRIMARY KEY,
+            source TEXT,
+            fingerprint TEXT,
+            no_change_count INTEGER DEFAULT 0,
+            last_changed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            checked_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        '''
+    ]),
+    (2, "Índices para as consultas de listagem", [
+        # get_all_news
+        "CREATE INDEX IF NOT EXISTS idx_news_created_at ON news(created_at)",
+        # get_unviewed_news / get_viewed_news
+        "CREATE INDEX IF NOT EXISTS idx_news_viewed_created_at ON news(viewed, created_at)",
+        # get_unsent_news / get_sent_news
+        "CREATE INDEX IF NOT EXISTS idx_news_sent_created_at ON news(sent_to_telegram, created_at)",
+        # get_news_by_source
+        "CREATE INDEX IF NOT EXISTS idx_news_source_created_at ON news(source, created_at)",
+        # get_news_by_category
+        "CREATE INDEX IF NOT EXISTS idx_news_category_created_at ON news(category, created_at)",
+        # news_exists_by_title
+        "CREATE INDEX IF NOT EXISTS idx_news_title_source ON news(title, source)",
+        # get_recent_activities
+        "CREATE INDEX IF NOT EXISTS idx_activity_log_timestamp ON activity_log(timestamp)"
+    ]),
+    (3, "Fila persistente de mensagens (outbox)", [
+        # status: pending -> sending -> sent | failed | blocked
+        '''
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT UNIQUE NOT NULL,
+            chat_id TEXT NOT NULL,
+            text TEXT NOT NULL,
+            parse_mode TEXT,
+            reply_markup TEXT,
+            disable_web_page_preview BOOLEAN DEFAULT FALSE,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            next_attempt_at REAL DEFAULT 0,
+            last_error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            sent_at TEXT
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_outbox_status_next_attempt ON outbox(status, next_attempt_at)",
+        "CREATE INDEX IF NOT EXISTS idx_outbox_chat_status ON outbox(chat_id, status, id)"
+    ]),
+    (4, "Contadores materializados das estatísticas (news_counters)", [
+        # scope: total, viewed e sent (key vazia), category e source (key = valor)
+        '''
+        CREATE TABLE IF NOT EXISTS news_counters (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+        ''',
+        # Os triggers mantêm os contadores exatos na mesma transação da escrita
+        f"CREATE TRIGGER IF NOT EXISTS news_counters_insert AFTER INSERT ON news BEGIN {_counter_changes('NEW', 1)} END",
+        f"CREATE TRIGGER IF NOT EXISTS news_counters_delete AFTER DELETE ON news BEGIN {_counter_changes('OLD', -1)} END",
+        f'''
+        CREATE TRIGGER IF NOT EXISTS news_counters_viewed AFTER UPDATE OF viewed ON news
+        WHEN {_flag("OLD.viewed")} != {_flag("NEW.viewed")}
+        BEGIN {_counter_upsert('viewed', "''", f'{_flag("NEW.viewed")} - {_flag("OLD.viewed")}')} END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS news_counters_sent AFTER UPDATE OF sent_to_telegram ON news
+        WHEN {_flag("OLD.sent_to_telegram")} != {_flag("NEW.sent_to_telegram")}
+        BEGIN {_counter_upsert('sent', "''", f'{_flag("NEW.sent_to_telegram")} - {_flag("OLD.sent_to_telegram")}')} END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS news_counters_category AFTER UPDATE OF category ON news
+        WHEN OLD.category IS NOT NEW.category
+        BEGIN
+            {_counter_upsert('category', 'OLD.category', -1, 'OLD.category IS NOT NULL')}
+            {_counter_upsert('category', 'NEW.category', 1, 'NEW.category IS NOT NULL')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS news_counters_source AFTER UPDATE OF source ON news
+        WHEN OLD.source IS NOT NEW.source
+        BEGIN
+            {_counter_upsert('source', 'OLD.source', -1, 'OLD.source IS NOT NULL')}
+            {_counter_upsert('source', 'NEW.source', 1, 'NEW.source IS NOT NULL')}
+        END
+        ''',
+        _rebuild_news_counters
+    ]),
+    (5, "Corpo das notícias comprimido em tabela separada (news_body)", [
+        # codec: 'zlib' ou 'zstd' (ver body_storage)
+        '''
+        CREATE TABLE IF NOT EXISTS news_body (
+            news_id INTEGER PRIMARY KEY,
+            codec TEXT NOT NULL,
+            body BLOB NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS news_body_delete AFTER DELETE ON news
+        BEGIN
+            DELETE FROM news_body WHERE news_id = OLD.id;
+        END
+        ''',
+        _move_news_bodies
+    ])
+]
+
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+# Migrações que reescrevem boa parte dos dados: as páginas ficam meio vazias
+# (não vão para a freelist), então o arquivo é compactado com VACUUM depois delas
+VACUUM_AFTER_MIGRATIONS = {5}
+
+# Tabelas com política de retenção: tabela -> coluna de data usada na idade dos registros
+RETENTION_TABLES = {
+    'news': 'created_at',
+    'activity_log': 'timestamp',
+    'outbox': 'created_at'
+}
+
+# Prefixo das fontes gravadas pelo scraping robusto (removido na exibição)
+ROBUST_SOURCE_PREFIX = "Scraping Robusto - "
+
+# Filtros das listagens paginadas (get_news_page): nome -> cláusula WHERE
+# Cada filtro usa um índice (coluna, created_at) e aceita no máximo um parâmetro
+NEWS_PAGE_FILTERS = {
+    'all': None,
+    'unviewed': "viewed = FALSE",
+    'viewed': "viewed = TRUE",
+    'sent': "sent_to_telegram = TRUE",
+    'unsent': "sent_to_telegram = FALSE",
+    'source': "source = ?",
+    'category': "category = ?"
+}
+
 class NewsDatabase:
-    def __init__(self):
-        self.db_path = DATABASE_PATH
+    # Bancos já verificados neste processo (evita repetir a checagem do schema)
+    _initialized_paths = set()
+    _init_lock = threading.Lock()
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DATABASE_PATH
+        
+        # Uma conexão persistente por thread (criada sob demanda)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
         self.init_database()
     
+    def _get_connection(self):
+        """
+        Retorna a conexão persistente da thread atual
+        Usar com 'with': faz commit/rollback da transação, sem fechar a conexão
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=DATABASE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False  # Só para close() poder fechar todas
+            )
+            
+            # WAL: leitores não bloqueiam atrás do escritor (scraping) e vice-versa
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{int(DATABASE_CACHE_SIZE_KB)}")
+            conn.execute(f"PRAGMA mmap_size={int(DATABASE_MMAP_SIZE)}")
+            conn.execute(f"PRAGMA busy_timeout={int(DATABASE_BUSY_TIMEOUT_MS)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        
+        return conn
+    
+    def close(self):
+        """Fecha todas as conexões abertas por esta instância"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+        
+        self._local = threading.local()
+    
     def init_database(self):
-        """Inicializa o banco de dados e cria as tabelas necessárias"""
+        """
+        Garante que o banco está na versão atual do schema
+        Com o banco em dia, custa uma única leitura de PRAGMA user_version
+        (e nada nas instâncias seguintes do mesmo processo)
+        """
+        if self.db_path in NewsDatabase._initialized_paths:
+            return
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Tabela para armazenar notícias
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS news (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        title TEXT NOT NULL,
-                        content TEXT,
-                        url TEXT UNIQUE,
-                        source TEXT NOT NULL,
-                        category TEXT,
-                        location TEXT,
-                        published_date TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        sent_to_telegram BOOLEAN DEFAULT FALSE,
-                        viewed BOOLEAN DEFAULT FALSE
-                    )
-                ''')
-                
-                # Adiciona o campo 'viewed' se não existir (migração)
-                try:
-                    cursor.execute("ALTER TABLE news ADD COLUMN viewed BOOLEAN DEFAULT FALSE")
-                    logger.info("Campo 'viewed' adicionado à tabela news")
-                except sqlite3.OperationalError:
-                    # Campo já existe
-                    pass
+            with NewsDatabase._init_lock:
+                if self.db_path in NewsDatabase._initialized_paths:
+                    return
                 
-                # Tabela para configurações do bot
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS bot_settings (
-                        key TEXT PRIMARY KEY,
-                        value TEXT,
-                        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
+                conn = self._get_connection()
+                current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if current_version == 0:
+                    # Banco novo: o modo de auto_vacuum só vale se definido antes das tabelas
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                if current_version < SCHEMA_VERSION:
+                    self._apply_migrations(conn, current_version)
+                    logger.info("Database initialized successfully")
                 
-                # Tabela para log de atividades
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS activity_log (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        activity TEXT NOT NULL,
-                        details TEXT,
-                        timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Tabela para usuários ativos (para notificações)
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS active_users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id TEXT UNIQUE NOT NULL,
-                        username TEXT,
-                        first_name TEXT,
-                        last_name TEXT,
-                        is_active BOOLEAN DEFAULT TRUE,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        last_activity TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                conn.commit()
-                logger.info("Database initialized successfully")
+                rewritten = current_version > 0 and any(
+                    current_version < version <= SCHEMA_VERSION for version in VACUUM_AFTER_MIGRATIONS
+                )
+                self._ensure_incremental_vacuum(conn, force_vacuum=rewritten)
+                NewsDatabase._initialized_paths.add(self.db_path)
                 
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
     
+    def _ensure_incremental_vacuum(self, conn, force_vacuum=False):
+        """
+        Converte bancos antigos para auto_vacuum incremental (uma única vez, na inicialização)
+        O VACUUM reescreve o arquivo inteiro; depois disso a retenção devolve o espaço
+        liberado aos poucos com PRAGMA incremental_vacuum
+        force_vacuum compacta o arquivo mesmo que ele já esteja no modo incremental
+        """
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2 and not force_vacuum:
+            return
+        
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        logger.info("Database compacted with VACUUM (auto_vacuum INCREMENTAL)")
+    
+    def _apply_migrations(self, conn, current_version=None):
+        """Aplica, em ordem, as migrações com versão maior que o PRAGMA user_version"""
+        if current_version is None:
+            current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        for version, description, steps in SCHEMA_MIGRATIONS:
+            if version <= current_version:
+                continue
+            
+            # Cada migração roda em uma transação própria, junto com a nova versão
+            try:
+                conn.execute("BEGIN")
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"Error applying migration {version}: {description}")
+                raise
+            
+            logger.info(f"Applied migration {version}: {description}")
+    
     def add_news(self, title, content, url, source, category=None, location=None, published_date=None):
         """Adiciona uma nova notícia ao banco de dados"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Verifica se a notícia já existe (baseado na URL)
@@ -98,7 +424,8 @@ class NewsDatabase:
                 cursor.execute('''
                     INSERT INTO news (title, content, url, source, category, location, published_date)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (title, content, url, source, category, location, published_date))
+                ''', (title, self._inline_content(content), url, source, category, location, published_date))
+                self._store_bodies(cursor, [(cursor.lastrowid, content)])
                 
                 conn.commit()
                 logger.info(f"Nova notícia salva: {title[:50]}...")
@@ -108,17 +435,142 @@ class NewsDatabase:
             logger.error(f"Error adding news: {e}")
             return False
     
+    def add_news_bulk(self, items, http_cache_entries=(), listing_fingerprints=()):
+        """
+        Insere um lote de notícias em uma única transação
+        Cada item é um dict com as chaves de add_news (title, content, url, source,
+        category, location, published_date). URLs repetidas são ignoradas pelo
+        ON CONFLICT; itens sem URL são comparados por título e fonte.
+        http_cache_entries: validadores (url, etag, last_modified, body_hash) das
+        páginas de onde os itens vieram, gravados na mesma transação
+        listing_fingerprints: impressões digitais (url, source, fingerprint) dessas
+        listagens, também na mesma transação
+        Retorna a lista dos itens realmente inseridos, com a chave 'id' preenchida.
+        """
+        new_items = []
+        
+        if not items and not http_cache_entries and not listing_fingerprints:
+            return new_items
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                for item in items:
+                    row = (
+                        item['title'], self._inline_content(item.get('content')), item.get('url'), item['source'],
+                        item.get('category'), item.get('location'), item.get('published_date')
+                    )
+                    
+                    if item.get('url'):
+                        cursor.execute('''
+                            INSERT INTO news (title, content, url, source, category, location, published_date)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(url) DO NOTHING
+                        ''', row)
+                    else:
+                        cursor.execute('''
+                            INSERT INTO news (title, content, url, source, category, location, published_date)
+                            SELECT ?, ?, ?, ?, ?, ?, ?
+                            WHERE NOT EXISTS (SELECT 1 FROM news WHERE title = ? AND source = ?)
+                        ''', row + (item['title'], item['source']))
+                    
+                    if cursor.rowcount == 1:
+                        item['id'] = cursor.lastrowid
+                        new_items.append(item)
+                
+                self._store_bodies(cursor, [(item['id'], item.get('content')) for item in new_items])
+                
+                # Validadores e impressões digitais só junto com as notícias: se o lote
+                # falhar, as páginas e listagens são processadas de novo no próximo ciclo
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body_hash, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', http_cache_entries)
+                cursor.executemany('''
+                    INSERT INTO listing_fingerprints (url, source, fingerprint)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        source = excluded.source,
+                        fingerprint = excluded.fingerprint,
+                        last_changed_at = CURRENT_TIMESTAMP,
+                        checked_at = CURRENT_TIMESTAMP
+                ''', listing_fingerprints)
+                conn.commit()
+                logger.info(f"Lote salvo: {len(new_items)} novas de {len(items)} notícias")
+                
+        except Exception as e:
+            logger.error(f"Error adding news in bulk: {e}")
+            return []
+        
+        return new_items
+    
+    def _inline_content(self, content):
+        """Valor da coluna news.content: o texto no modo 'inline', NULL no modo 'compressed'"""
+        return None if NEWS_BODY_STORAGE == 'compressed' else content
+    
+    def _store_bodies(self, cursor, bodies):
+        """Grava os corpos [(news_id, texto)] comprimidos em news_body (modo 'compressed')"""
+        if NEWS_BODY_STORAGE != 'compressed':
+            return
+        cursor.executemany(
+            "INSERT OR REPLACE INTO news_body (news_id, codec, body) VALUES (?, ?, ?)",
+            [(news_id, *compress_body(content)) for news_id, content in bodies if content]
+        )
+    
+    def get_news_bodies(self, news_ids):
+        """
+        Retorna {id: texto} com o corpo das notícias, para montar as mensagens
+        Lê de news_body (descomprimindo) ou de news.content, conforme onde o corpo estiver
+        """
+        news_ids = list(news_ids)
+        if not news_ids:
+            return {}
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                placeholders = ','.join('?' * len(news_ids))
+                cursor.execute(f'''
+                    SELECT news.id, news.content, news_body.codec, news_body.body
+                    FROM news LEFT JOIN news_body ON news_body.news_id = news.id
+                    WHERE news.id IN ({placeholders})
+                ''', news_ids)
+                rows = cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting news bodies: {e}")
+            return {}
+        
+        bodies = {}
+        for news_id, content, codec, body in rows:
+            if body is None:
+                bodies[news_id] = content or ""
+                continue
+            # Um corpo ilegível (ex.: zstd sem o pacote zstandard) não derruba a página inteira
+            try:
+                bodies[news_id] = decompress_body(codec, body)
+            except Exception as e:
+                logger.error(f"Error decompressing body of news {news_id} ({codec}): {e}")
+                bodies[news_id] = ""
+        return bodies
+    
+    def get_news_body(self, news_id):
+        """Retorna o corpo de uma notícia (texto vazio se não houver)"""
+        return self.get_news_bodies([news_id]).get(news_id, "")
+    
     def get_all_news(self, limit=None):
         """Retorna todas as notícias do banco"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news ORDER BY created_at DESC"
+                params = []
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -128,14 +580,16 @@ class NewsDatabase:
     def get_unviewed_news(self, limit=None):
         """Retorna notícias não visualizadas"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE viewed = FALSE ORDER BY created_at DESC"
+                params = []
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -145,14 +599,16 @@ class NewsDatabase:
     def get_unsent_news(self, limit=None):
         """Retorna notícias não enviadas para o Telegram"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE sent_to_telegram = FALSE ORDER BY created_at DESC"
+                params = []
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -162,14 +618,16 @@ class NewsDatabase:
     def get_sent_news(self, limit=None):
         """Retorna notícias enviadas para o Telegram"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE sent_to_telegram = TRUE ORDER BY created_at DESC"
+                params = []
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -179,14 +637,16 @@ class NewsDatabase:
     def get_viewed_news(self, limit=None):
         """Retorna notícias já visualizadas"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE viewed = TRUE ORDER BY created_at DESC"
+                params = []
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query)
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -196,16 +656,10 @@ class NewsDatabase:
     def get_view_stats(self):
         """Retorna estatísticas de visualização das notícias"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Total de notícias
-                cursor.execute("SELECT COUNT(*) FROM news")
-                total = cursor.fetchone()[0]
-                
-                # Notícias visualizadas
-                cursor.execute("SELECT COUNT(*) FROM news WHERE viewed = TRUE")
-                viewed = cursor.fetchone()[0]
+            with self._get_connection() as conn:
+                counters = self._read_counters(conn, ('total', 'viewed'))
+                total = counters.get('total', 0)
+                viewed = counters.get('viewed', 0)
                 
                 # Notícias não visualizadas
                 unviewed = total - viewed
@@ -232,14 +686,16 @@ class NewsDatabase:
     def get_news_by_category(self, category, limit=None):
         """Retorna notícias de uma categoria específica"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE category = ? ORDER BY created_at DESC"
+                params = [category]
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query, (category,))
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
@@ -249,24 +705,118 @@ class NewsDatabase:
     def get_news_by_source(self, source, limit=None):
         """Retorna notícias de uma fonte específica"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM news WHERE source = ? ORDER BY created_at DESC"
+                params = [source]
                 if limit:
-                    query += f" LIMIT {limit}"
+                    query += " LIMIT ?"
+                    params.append(limit)
                 
-                cursor.execute(query, (source,))
+                cursor.execute(query, params)
                 return cursor.fetchall()
                 
         except Exception as e:
             logger.error(f"Error getting news by source: {e}")
             return []
     
+    def get_news_page(self, view, value=None, cursor=None, direction='older', limit=10):
+        """
+        Página de notícias com paginação por cursor (keyset) em (created_at, id)
+        
+        view: filtro de NEWS_PAGE_FILTERS; value: parâmetro do filtro (ex.: a fonte)
+        cursor: (created_at, id) da notícia na borda da página anterior, ou None para a primeira
+        direction: 'older' (notícias depois do cursor) ou 'newer' (antes do cursor)
+        
+        Retorna {'items': [...], 'has_newer': bool, 'has_older': bool,
+        'newer_cursor': (created_at, id), 'older_cursor': (created_at, id)}, com os itens
+        sempre do mais recente para o mais antigo. Os cursores são as bordas da página,
+        para pedir a página seguinte em cada direção. O custo não depende da profundidade.
+        """
+        empty = {'items': [], 'has_newer': False, 'has_older': False, 'newer_cursor': None, 'older_cursor': None}
+        try:
+            clause = NEWS_PAGE_FILTERS[view]
+            where = [clause] if clause else []
+            params = [value] if clause and '?' in clause else []
+            
+            with self._get_connection() as conn:
+                cursor_db = conn.cursor()
+                
+                page_where = list(where)
+                page_params = list(params)
+                if cursor:
+                    page_where.append("(created_at, id) > (?, ?)" if direction == 'newer' else "(created_at, id) < (?, ?)")
+                    page_params.extend(cursor)
+                order = "ASC" if direction == 'newer' else "DESC"
+                
+                query = "SELECT * FROM news"
+                if page_where:
+                    query += " WHERE " + " AND ".join(page_where)
+                query += f" ORDER BY created_at {order}, id {order} LIMIT ?"
+                cursor_db.execute(query, page_params + [limit])
+                items = cursor_db.fetchall()
+                
+                if direction == 'newer':
+                    items.reverse()
+                if not items:
+                    return empty
+                
+                # Existe algo antes/depois da página? (consultas pelo mesmo índice)
+                def exists(comparison, edge):
+                    exists_where = where + [f"(created_at, id) {comparison} (?, ?)"]
+                    cursor_db.execute(
+                        "SELECT EXISTS (SELECT 1 FROM news WHERE " + " AND ".join(exists_where) + ")",
+                        params + list(edge)
+                    )
+                    return bool(cursor_db.fetchone()[0])
+                
+                newer_cursor = (items[0][8], items[0][0])
+                older_cursor = (items[-1][8], items[-1][0])
+                return {
+                    'items': items,
+                    'has_newer': exists('>', newer_cursor),
+                    'has_older': exists('<', older_cursor),
+                    'newer_cursor': newer_cursor,
+                    'older_cursor': older_cursor
+                }
+                
+        except Exception as e:
+            logger.error(f"Error getting news page: {e}")
+            return empty
+    
+    def get_all_news_page(self, cursor=None, direction='older', limit=10):
+        """Página de todas as notícias (ver get_news_page)"""
+        return self.get_news_page('all', cursor=cursor, direction=direction, limit=limit)
+    
+    def get_unviewed_news_page(self, cursor=None, direction='older', limit=10):
+        """Página de notícias não visualizadas (ver get_news_page)"""
+        return self.get_news_page('unviewed', cursor=cursor, direction=direction, limit=limit)
+    
+    def get_viewed_news_page(self, cursor=None, direction='older', limit=10):
+        """Página de notícias visualizadas (ver get_news_page)"""
+        return self.get_news_page('viewed', cursor=cursor, direction=direction, limit=limit)
+    
+    def get_sent_news_page(self, cursor=None, direction='older', limit=10):
+        """Página de notícias enviadas ao Telegram (ver get_news_page)"""
+        return self.get_news_page('sent', cursor=cursor, direction=direction, limit=limit)
+    
+    def get_unsent_news_page(self, cursor=None, direction='older', limit=10):
+        """Página de notícias ainda não enviadas (ver get_news_page)"""
+        return self.get_news_page('unsent', cursor=cursor, direction=direction, limit=limit)
+    
+    def get_news_page_by_source(self, source, cursor=None, direction='older', limit=10):
+        """Página de notícias de uma fonte (ver get_news_page)"""
+        return self.get_news_page('source', source, cursor, direction, limit)
+    
+    def get_news_page_by_category(self, category, cursor=None, direction='older', limit=10):
+        """Página de notícias de uma categoria (ver get_news_page)"""
+        return self.get_news_page('category', category, cursor, direction, limit)
+    
     def mark_as_viewed(self, news_id):
         """Marca uma notícia como visualizada"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("UPDATE news SET viewed = TRUE WHERE id = ?", (news_id,))
                 conn.commit()
@@ -278,7 +828,7 @@ class NewsDatabase:
     def mark_as_sent(self, news_id):
         """Marca uma notícia como enviada para o Telegram"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("UPDATE news SET sent_to_telegram = TRUE WHERE id = ?", (news_id,))
                 conn.commit()
@@ -290,29 +840,23 @@ class NewsDatabase:
     def get_stats(self):
         """Retorna estatísticas do banco de dados"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Total de notícias
-                cursor.execute("SELECT COUNT(*) FROM news")
-                total_news = cursor.fetchone()[0]
+                # Valores pré-calculados em news_counters (mantidos pelos triggers)
+                counters = self._read_counters(conn, ('total', 'viewed', 'sent'))
+                total_news = counters.get('total', 0)
+                unviewed = total_news - counters.get('viewed', 0)
+                unsent = total_news - counters.get('sent', 0)
                 
                 # Notícias por categoria
-                cursor.execute("SELECT category, COUNT(*) FROM news WHERE category IS NOT NULL GROUP BY category")
+                cursor.execute("SELECT key, count FROM news_counters WHERE scope = 'category' AND count > 0")
                 categories = dict(cursor.fetchall())
                 
                 # Notícias por fonte
-                cursor.execute("SELECT source, COUNT(*) FROM news GROUP BY source ORDER BY COUNT(*) DESC")
+                cursor.execute("SELECT key, count FROM news_counters WHERE scope = 'source' AND count > 0 ORDER BY count DESC")
                 sources = dict(cursor.fetchall())
                 
-                # Notícias não visualizadas
-                cursor.execute("SELECT COUNT(*) FROM news WHERE viewed = FALSE")
-                unviewed = cursor.fetchone()[0]
-                
-                # Notícias não enviadas
-                cursor.execute("SELECT COUNT(*) FROM news WHERE sent_to_telegram = FALSE")
-                unsent = cursor.fetchone()[0]
-                
                 return {
                     'total_news': total_news,
                     'categories': categories,
@@ -328,18 +872,80 @@ class NewsDatabase:
     def get_total_news_count(self):
         """Retorna o total de notícias no banco"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM news")
-                return cursor.fetchone()[0]
+            with self._get_connection() as conn:
+                return self._read_counters(conn, ('total',)).get('total', 0)
         except Exception as e:
             logger.error(f"Error getting total news count: {e}")
             return 0
     
+    def get_source_counts(self, strip_prefix=ROBUST_SOURCE_PREFIX):
+        """
+        Retorna [(fonte, quantidade)] das fontes com notícias, da maior para a menor
+        Lê news_counters (uma linha por fonte, sem tocar na tabela news) e remove o
+        prefixo do scraping robusto, somando as fontes que ficam com o mesmo nome
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT CASE WHEN substr(key, 1, length(:prefix)) = :prefix
+                                THEN substr(key, length(:prefix) + 1) ELSE key END AS name,
+                           SUM(count) AS total
+                    FROM news_counters
+                    WHERE scope = 'source' AND count > 0
+                    GROUP BY name
+                    ORDER BY total DESC, name
+                ''', {'prefix': strip_prefix or ''})
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting source counts: {e}")
+            return []
+    
+    def _read_counters(self, conn, scopes):
+        """Lê os contadores globais (key vazia) de news_counters: {scope: count}"""
+        placeholders = ','.join('?' * len(scopes))
+        rows = conn.execute(
+            f"SELECT scope, count FROM news_counters WHERE key = '' AND scope IN ({placeholders})",
+            scopes
+        ).fetchall()
+        return dict(rows)
+    
+    def rebuild_counters(self):
+        """
+        Recalcula news_counters a partir da tabela news (checagem de consistência)
+        Retorna {(scope, key): (valor antigo, valor correto)} com as divergências corrigidas
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("SELECT scope, key, count FROM news_counters WHERE count != 0")
+                before = {(scope, key): count for scope, key, count in cursor.fetchall()}
+                
+                _rebuild_news_counters(conn)
+                
+                cursor.execute("SELECT scope, key, count FROM news_counters WHERE count != 0")
+                after = {(scope, key): count for scope, key, count in cursor.fetchall()}
+                conn.commit()
+            
+            mismatches = {
+                counter: (before.get(counter, 0), after.get(counter, 0))
+                for counter in before.keys() | after.keys()
+                if before.get(counter, 0) != after.get(counter, 0)
+            }
+            if mismatches:
+                logger.warning(f"News counters rebuilt: {len(mismatches)} mismatches fixed")
+            else:
+                logger.info("News counters rebuilt: no mismatches")
+            return mismatches
+        except Exception as e:
+            logger.error(f"Error rebuilding news counters: {e}")
+            return None
+    
     def log_activity(self, activity, details=None):
         """Registra uma atividade no log"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO activity_log (activity, details)
@@ -352,7 +958,7 @@ class NewsDatabase:
     def get_recent_activities(self, limit=10):
         """Retorna atividades recentes"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT activity, details, timestamp 
@@ -368,7 +974,7 @@ class NewsDatabase:
     def add_active_user(self, user_id, username=None, first_name=None, last_name=None):
         """Adiciona ou atualiza um usuário ativo"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO active_users 
@@ -384,7 +990,7 @@ class NewsDatabase:
     def get_active_users(self):
         """Retorna lista de usuários ativos"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT user_id, username, first_name, last_name 
@@ -399,7 +1005,7 @@ class NewsDatabase:
     def deactivate_user(self, user_id):
         """Desativa um usuário (para parar notificações)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE active_users 
@@ -412,10 +1018,122 @@ class NewsDatabase:
             logger.error(f"Error deactivating user: {e}")
             return False
     
+    def deactivate_users(self, user_ids):
+        """Desativa vários usuários em uma única transação; retorna quantos foram desativados"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    UPDATE active_users 
+                    SET is_active = FALSE 
+                    WHERE user_id = ? AND is_active = TRUE
+                ''', [(str(user_id),) for user_id in user_ids])
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error deactivating users: {e}")
+            return 0
+    
+    def get_expired_rows(self, table, where, params=(), limit=500):
+        """
+        Retorna (colunas, linhas) de até `limit` registros de `table` que atendem `where`
+        Usado pela retenção para arquivar um lote antes de removê-lo
+        """
+        if table not in RETENTION_TABLES:
+            raise ValueError(f"Table without retention policy: {table}")
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT * FROM {table} WHERE {where} ORDER BY {RETENTION_TABLES[table]} LIMIT ?",
+                    list(params) + [limit]
+                )
+                columns = [column[0] for column in cursor.description]
+                return columns, cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting expired rows from {table}: {e}")
+            return [], []
+    
+    def delete_rows(self, table, ids):
+        """
+        Remove registros de `table` pelo id em uma única transação curta; retorna quantos saíram
+        Erros são propagados: o lote já foi arquivado e a retenção precisa falhar em vez de seguir
+        """
+        if table not in RETENTION_TABLES:
+            raise ValueError(f"Table without retention policy: {table}")
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in ids])
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error deleting rows from {table}: {e}")
+            raise
+    
+    def get_source_cutoffs(self, max_rows):
+        """
+        Para cada fonte com mais de `max_rows` notícias, retorna (fonte, created_at, id)
+        da notícia mais recente que já passou do limite (ela e as mais antigas sobram)
+        As fontes vêm de news_counters e o corte usa o índice (source, created_at)
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT key FROM news_counters WHERE scope = 'source' AND count > ?",
+                    (max_rows,)
+                )
+                cutoffs = []
+                for (source,) in cursor.fetchall():
+                    cursor.execute('''
+                        SELECT created_at, id FROM news
+                        WHERE source = ?
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT 1 OFFSET ?
+                    ''', (source, max_rows))
+                    row = cursor.fetchone()
+                    if row:
+                        cutoffs.append((source, row[0], row[1]))
+                return cutoffs
+        except Exception as e:
+            logger.error(f"Error getting source cutoffs: {e}")
+            return []
+    
+    def incremental_vacuum(self, pages_per_step=1000):
+        """
+        Devolve ao sistema as páginas livres do arquivo, em passos de `pages_per_step`
+        (cada passo é uma transação curta); retorna quantas páginas foram liberadas
+        """
+        try:
+            with self._get_connection() as conn:
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    logger.warning("Incremental vacuum skipped: auto_vacuum is not INCREMENTAL")
+                    return 0
+                
+                freed = 0
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                while free_pages > 0:
+                    conn.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+                    conn.commit()
+                    remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    if remaining >= free_pages:
+                        break
+                    freed += free_pages - remaining
+                    free_pages = remaining
+                
+                logger.info(f"Incremental vacuum freed {freed} pages")
+                return freed
+        except Exception as e:
+            logger.error(f"Error running incremental vacuum: {e}")
+            return 0
+    
     def news_exists(self, url):
         """Verifica se uma notícia já existe baseada na URL ou título"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Se a URL não for None, verifica por URL
@@ -430,10 +1148,129 @@ class NewsDatabase:
             logger.error(f"Error checking if news exists: {e}")
             return False
     
+    def get_existing_urls(self, urls):
+        """Retorna o subconjunto das URLs informadas que já existe no banco (consulta em lote)"""
+        urls = [url for url in set(urls) if url]
+        existing = set()
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+                for i in range(0, len(urls), 500):
+                    chunk = urls[i:i + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(f"SELECT url FROM news WHERE url IN ({placeholders})", chunk)
+                    existing.update(row[0] for row in cursor.fetchall())
+                
+        except Exception as e:
+            logger.error(f"Error checking existing urls: {e}")
+        
+        return existing
+    
+    def get_http_cache_entry(self, url):
+        """Retorna os validadores HTTP salvos para uma URL (ou None)"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT etag, last_modified, body_hash FROM http_cache WHERE url = ?", (url,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                return {
+                    'etag': row[0],
+                    'last_modified': row[1],
+                    'body_hash': row[2]
+                }
+        except Exception as e:
+            logger.error(f"Error getting http cache entry: {e}")
+            return None
+    
+    def save_http_cache_entry(self, url, etag=None, last_modified=None, body_hash=None):
+        """Salva (ou atualiza) os validadores HTTP de uma URL"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body_hash, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (url, etag, last_modified, body_hash))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error saving http cache entry: {e}")
+            return False
+    
+    def get_listing_fingerprint(self, url):
+        """Retorna a última impressão digital salva para a listagem da URL"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT fingerprint FROM listing_fingerprints WHERE url = ?", (url,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error getting listing fingerprint: {e}")
+            return None
+    
+    def save_listing_fingerprint(self, url, source, fingerprint):
+        """Salva a impressão digital de uma listagem que mudou"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO listing_fingerprints (url, source, fingerprint)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        source = excluded.source,
+                        fingerprint = excluded.fingerprint,
+                        last_changed_at = CURRENT_TIMESTAMP,
+                        checked_at = CURRENT_TIMESTAMP
+                ''', (url, source, fingerprint))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error saving listing fingerprint: {e}")
+            return False
+    
+    def record_listing_no_change(self, url):
+        """Incrementa a métrica 'sem alterações' da listagem"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE listing_fingerprints
+                    SET no_change_count = no_change_count + 1, checked_at = CURRENT_TIMESTAMP
+                    WHERE url = ?
+                ''', (url,))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error recording listing no change: {e}")
+            return False
+    
+    def get_listing_change_stats(self):
+        """Retorna a métrica 'sem alterações' por fonte"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT source, SUM(no_change_count), MAX(last_changed_at), MAX(checked_at)
+                    FROM listing_fingerprints
+                    GROUP BY source
+                    ORDER BY source
+                ''')
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error getting listing change stats: {e}")
+            return []
+    
     def news_exists_by_title(self, title, source):
         """Verifica se uma notícia já existe baseada no título e fonte"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Verifica por título e fonte (para casos onde URL é None)
@@ -447,3 +1284,150 @@ class NewsDatabase:
             logger.error(f"Error checking if news exists by title: {e}")
             return False
     
+    
+    def optimize(self):
+        """Manutenção periódica: atualiza as estatísticas do planejador e trunca o WAL"""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                logger.info("Database optimized")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Error optimizing database: {e}")
+            return False
+    
+    def enqueue_outbox_messages(self, messages):
+        """
+        Adiciona mensagens à outbox em uma única transação
+        Mensagens com idempotency_key já existente são ignoradas; retorna quantas entraram
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO outbox
+                        (idempotency_key, chat_id, text, parse_mode, reply_markup, disable_web_page_preview)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [
+                    (
+                        message['idempotency_key'],
+                        str(message['chat_id']),
+                        message['text'],
+                        message.get('parse_mode'),
+                        message.get('reply_markup'),
+                        bool(message.get('disable_web_page_preview', False))
+                    )
+                    for message in messages
+                ])
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error enqueuing outbox messages: {e}")
+            return 0
+    
+    def claim_outbox_batch(self, limit, now):
+        """
+        Reserva (status 'sending') até `limit` mensagens prontas para envio
+        Só a mensagem mais antiga pendente de cada chat é reservada, preservando a ordem por chat
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute('''
+                    SELECT id, idempotency_key, chat_id, text, parse_mode, reply_markup,
+                           disable_web_page_preview, attempts
+                    FROM outbox AS o
+                    WHERE status = 'pending' AND next_attempt_at <= ?
+                      AND NOT EXISTS (
+                          SELECT 1 FROM outbox AS prev
+                          WHERE prev.chat_id = o.chat_id
+                            AND prev.status IN ('pending', 'sending')
+                            AND prev.id < o.id
+                      )
+                    ORDER BY id
+                    LIMIT ?
+                ''', (now, limit))
+                
+                columns = [column[0] for column in cursor.description]
+                batch = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                
+                cursor.executemany(
+                    "UPDATE outbox SET status = 'sending' WHERE id = ?",
+                    [(message['id'],) for message in batch]
+                )
+                conn.commit()
+                return batch
+        except Exception as e:
+            logger.error(f"Error claiming outbox batch: {e}")
+            return []
+    
+    def update_outbox_messages(self, updates):
+        """
+        Grava o resultado de um lote de envios em uma única transação
+        updates: dicts com id, status, attempts, next_attempt_at e last_error
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    UPDATE outbox
+                    SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?,
+                        sent_at = CASE WHEN ? = 'sent' THEN CURRENT_TIMESTAMP ELSE sent_at END
+                    WHERE id = ?
+                ''', [
+                    (
+                        update['status'],
+                        update['attempts'],
+                        update.get('next_attempt_at', 0),
+                        update.get('last_error'),
+                        update['status'],
+                        update['id']
+                    )
+                    for update in updates
+                ])
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error updating outbox messages: {e}")
+            return False
+    
+    def block_outbox_chats(self, chat_ids):
+        """Marca como 'blocked' as mensagens pendentes de chats que bloquearam o bot"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "UPDATE outbox SET status = 'blocked' WHERE chat_id = ? AND status = 'pending'",
+                    [(str(chat_id),) for chat_id in chat_ids]
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error blocking outbox chats: {e}")
+            return 0
+    
+    def reset_outbox_in_flight(self):
+        """Devolve à fila as mensagens que ficaram em 'sending' (processo interrompido)"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error resetting in-flight outbox messages: {e}")
+            return 0
+    
+    def get_outbox_stats(self):
+        """Quantidade de mensagens da outbox por status"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+                return dict(cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error getting outbox stats: {e}")
+            return {}
@@ -0,0 +1,33 @@
+"""
+Camada de parsing HTML dos scrapers
+Usa o lxml (bem mais rápido que o html.parser) quando disponível e permite
+restringir a árvore à região relevante da página com um SoupStrainer.
+"""
+
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    logger.warning("lxml não instalado, usando html.parser (mais lento)")
+    PARSER = 'html.parser'
+
+# Apenas os links com href (listagens que só usam find_all('a', href=True))
+LINKS_ONLY = SoupStrainer('a', href=True)
+
+
+def parse_html(content, parse_only=None):
+    """
+    Faz o parsing do HTML com o parser mais rápido disponível
+
+    parse_only pode ser um SoupStrainer, um nome de tag ou uma lista de nomes
+    de tags; nesse caso só esses elementos (e seus filhos) entram na árvore.
+    """
+    if parse_only is not None and not isinstance(parse_only, SoupStrainer):
+        parse_only = SoupStrainer(parse_only)
+
+    return BeautifulSoup(content, PARSER, parse_only=parse_only)
@@ -0,0 +1,164 @@
+"""
+Classificador de notícias por palavras-chave (Aho-Corasick)
+Compila todos os termos de relevância e de categoria em um único autômato e
+devolve relevância, categoria e termos encontrados em uma passada pelo texto.
+A busca é feita sobre o texto normalizado (sem acentos, case folding) e só
+aceita ocorrências no início de uma palavra.
+"""
+
+from collections import deque, namedtuple
+from text_normalizer import normalize
+
+# Resultado da classificação de uma notícia
+KeywordMatch = namedtuple('KeywordMatch', ['relevant', 'category', 'terms'])
+
+
+class AhoCorasick:
+    """Autômato Aho-Corasick para busca simultânea de vários termos"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._output[node].append(index)
+
+        # Links de falha em largura (BFS), herdando as saídas do sufixo
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text):
+        """Gera (posição_final, índice_do_termo) para cada ocorrência no texto"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield position, index
+
+
+class KeywordMatcher:
+    """
+    Classifica títulos/conteúdos em uma passada
+
+    relevance_terms: termos que tornam a notícia relevante
+    category_rules: pares (termo, categoria) em ordem de prioridade; vale a
+        regra de menor posição entre os termos encontrados
+    category_from_title: se True, só termos do título definem a categoria
+    whole_words: se True, o termo precisa terminar em fim de palavra e
+        ocorrências contidas em um termo maior são descartadas (localidades);
+        caso contrário basta começar no início de uma palavra ("tráfico"
+        casa com "traficantes", mas "operação" não casa com "cooperação")
+    """
+
+    def __init__(self, relevance_terms, category_rules, default_category=None,
+                 category_from_title=False, whole_words=False):
+        self.default_category = default_category
+        self.category_from_title = category_from_title
+        self.whole_words = whole_words
+        self._relevance = set()
+        self._rules = {}
+
+        for term in relevance_terms:
+            self._relevance.add(self._normalize_term(term))
+
+        for rank, (term, category) in enumerate(category_rules):
+            self._rules.setdefault(self._normalize_term(term), (rank, category))
+
+        # Termos únicos preservando a ordem de declaração
+        terms = [self._normalize_term(term) for term in relevance_terms] + list(self._rules)
+        self.terms = [term for term in dict.fromkeys(terms) if term]
+        self._automaton = AhoCorasick(self.terms)
+
+    @staticmethod
+    def _normalize_term(term):
+        return " ".join(normalize(term).tokens)
+
+    def _find(self, text):
+        """Ocorrências (início, fim, termo) que respeitam as fronteiras de palavra"""
+        matches = []
+
+        for end, index in self._automaton.iter_matches(text):
+            term = self.terms[index]
+            start = end - len(term) + 1
+            if text[start - 1] != " ":
+                continue
+            if self.whole_words and text[end + 1] != " ":
+                continue
+            matches.append((start, end, term))
+
+        if self.whole_words:
+            matches = [
+                (start, end, term) for start, end, term in matches
+                if not any(s <= start and end <= e and (e - s) > (end - start) for s, e, _ in matches)
+            ]
+
+        return matches
+
+    def match(self, title, content=""):
+        """
+        Retorna KeywordMatch(relevant, category, terms) para a notícia
+        title e content podem ser str ou NormalizedText (já normalizados)
+        """
+        title = normalize(title)
+        content = normalize(content)
+
+        # Título e conteúdo em um único texto; o título termina antes de title_end
+        text = title.text + content.text[1:]
+        title_end = len(title.text) - 1
+
+        relevant = False
+        best_rule = None
+        found = []
+
+        for start, end, term in self._find(text):
+            if term not in found:
+                found.append(term)
+
+            if term in self._relevance:
+                relevant = True
+
+            rule = self._rules.get(term)
+            if rule is None:
+                continue
+            if self.category_from_title and end >= title_end:
+                continue
+            if best_rule is None or rule[0] < best_rule[0]:
+                best_rule = rule
+
+        category = best_rule[1] if best_rule else self.default_category
+        return KeywordMatch(relevant, category, found)
+
+
+def build_location_matcher(locations, state_names=('Rio Grande do Sul', 'RS')):
+    """
+    Matcher de localidades (palavras inteiras)
+    A categoria é a localidade encontrada; cidades têm prioridade sobre o estado
+    """
+    ordered = [loc for loc in locations if loc not in state_names] + [loc for loc in locations if loc in state_names]
+    return KeywordMatcher(locations, [(loc, loc) for loc in ordered], whole_words=True)
@@ -0,0 +1,102 @@
+"""
+Métricas de execução das tarefas agendadas (JobQueue)
+Registra, por tarefa, execuções, falhas, execuções puladas por sobreposição
+e a duração de cada rodada, para exibição no /stats e nos logs.
+"""
+
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class JobStats:
+    """Contadores e tempos de uma tarefa"""
+
+    __slots__ = ('name', 'runs', 'failures', 'skipped', 'running',
+                 'last_started_at', 'last_duration', 'total_duration', 'max_duration', 'last_error')
+
+    def __init__(self, name):
+        self.name = name
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.running = False
+        self.last_started_at = None
+        self.last_duration = None
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_error = None
+
+    @property
+    def avg_duration(self):
+        return self.total_duration / self.runs if self.runs else None
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'running': self.running,
+            'last_started_at': self.last_started_at,
+            'last_duration': self.last_duration,
+            'avg_duration': self.avg_duration,
+            'max_duration': self.max_duration,
+            'last_error': self.last_error
+        }
+
+
+class JobMetrics:
+    """Registro das métricas de todas as tarefas do processo"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name):
+        with self._lock:
+            if name not in self._jobs:
+                self._jobs[name] = JobStats(name)
+            return self._jobs[name]
+
+    @asynccontextmanager
+    async def track(self, name):
+        """Mede uma execução da tarefa (use com 'async with')"""
+        stats = self._stats(name)
+        stats.running = True
+        stats.last_started_at = datetime.now()
+        started = time.monotonic()
+
+        try:
+            yield stats
+        except Exception as e:
+            stats.failures += 1
+            stats.last_error = str(e)
+            raise
+        finally:
+            duration = time.monotonic() - started
+            stats.running = False
+            stats.runs += 1
+            stats.last_duration = duration
+            stats.total_duration += duration
+            stats.max_duration = max(stats.max_duration, duration)
+            logger.info(f"⏱️ Tarefa '{name}' concluída em {duration:.1f}s (execução #{stats.runs})")
+
+    def record_skipped(self, name):
+        """Conta uma execução descartada porque a anterior ainda estava rodando"""
+        self._stats(name).skipped += 1
+        logger.warning(f"⏭️ Tarefa '{name}' pulada: execução anterior ainda em andamento")
+
+    def snapshot(self):
+        """Métricas de todas as tarefas (lista de dicts)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [stats.as_dict() for stats in jobs]
+
+
+# Instância compartilhada pelo processo
+job_metrics = JobMetrics()
@@ -1,21 +1,52 @@
 import requests
-from bs4 import BeautifulSoup
 import logging
 from datetime import datetime, timedelta
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
 from database import NewsDatabase
-from config import SEARCH_KEYWORDS, RS_LOCATIONS, PORTAL_URLS
-import time
+from page_cache import PageCache, PendingValidators, ScrapeResult
+from html_parsing import parse_html, LINKS_ONLY
+from keyword_matcher import KeywordMatcher, build_location_matcher
+from text_normalizer import normalize, normalized_fields
+from config import (SEARCH_KEYWORDS, RS_LOCATIONS, PORTAL_URLS, PORTAL_RATE_LIMITS,
+                    ARTICLE_FETCH_WORKERS, ARTICLE_FETCH_PER_HOST, ARTICLE_FETCH_RATE_LIMIT,
+                    ARTICLE_FETCH_BURST)
+from rate_limiter import host_rate_limiter, HostRateLimiter
 import random
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Palavras-chave específicas e precisas, em ordem de prioridade para a categoria
+TARGET_KEYWORDS = [
+    ('drogas', 'drogas'), ('armas', 'armas'), ('maconha', 'drogas'), ('cocaína', 'drogas'),
+    ('ecstasy', 'drogas'), ('skunk', 'drogas'), ('apreensão', 'policial'), ('prisão', 'policial'),
+    ('tráfico', 'tráfico'), ('facção', 'tráfico'), ('operação', 'policial')
+]
+
+# Compilado uma única vez; termos só de SEARCH_KEYWORDS caem na categoria "geral"
+KEYWORD_MATCHER = KeywordMatcher(
+    [keyword for keyword, _ in TARGET_KEYWORDS] + SEARCH_KEYWORDS,
+    TARGET_KEYWORDS + [(keyword, 'geral') for keyword in SEARCH_KEYWORDS]
+)
+
+LOCATION_MATCHER = build_location_matcher(RS_LOCATIONS)
+
+# Downloads de artigos têm o próprio orçamento por host: uma rajada de notícias
+# novas não disputa os tokens das páginas de listagem (PORTAL_RATE_LIMITS)
+article_rate_limiter = HostRateLimiter(ARTICLE_FETCH_RATE_LIMIT, ARTICLE_FETCH_BURST)
+
 class NewsScraper:
     def __init__(self):
         self.db = NewsDatabase()
+        # Índice em memória das URLs já salvas (evita baixar artigos repetidos)
+        self.known_urls = set()
+        # Validadores HTTP das páginas de listagem (ETag / Last-Modified / hash)
+        self.page_cache = PageCache(self.db)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -24,40 +55,53 @@ class NewsScraper:
         self.session.verify = False
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        
+        # Pool limitado para baixar o conteúdo dos artigos em paralelo
+        adapter = HTTPAdapter(pool_maxsize=max(ARTICLE_FETCH_WORKERS, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.article_executor = ThreadPoolExecutor(max_workers=ARTICLE_FETCH_WORKERS, thread_name_prefix="article")
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
     
-    def is_relevant_news(self, title: str, content: str) -> tuple:
+    def is_relevant_news(self, title: str, content: str = "") -> tuple:
         """
         Verifica se a notícia é relevante baseada nas palavras-chave específicas
+        Aceita textos crus ou já normalizados (NormalizedText)
         Retorna (is_relevant, category)
         """
-        text = f"{title} {content}".lower()
-        
-        # Palavras-chave específicas e precisas
-        target_keywords = [
-            'drogas', 'armas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 
-            'apreensão', 'prisão', 'tráfico', 'facção', 'operação'
-        ]
+        match = KEYWORD_MATCHER.match(title, content)
         
-        # Verifica cada palavra-chave específica
-        for keyword in target_keywords:
-            if keyword in text:
-                # Determina categoria baseada na palavra-chave
-                if keyword in ['drogas', 'maconha', 'cocaína', 'ecstasy', 'skunk']:
-                    category = "drogas"
-                elif keyword == 'armas':
-                    category = "armas"
-                elif keyword in ['tráfico', 'facção']:
-                    category = "tráfico"
-                elif keyword in ['apreensão', 'prisão', 'operação']:
-                    category = "policial"
-                else:
-                    category = "geral"
-                
-                logger.info(f"Notícia relevante ({category}): {title[:50]}... - Palavra-chave: {keyword}")
-                return True, category
+        if match.relevant:
+            logger.info(f"Notícia relevante ({match.category}): {str(title)[:50]}... - Palavras-chave: {', '.join(match.terms)}")
+            return True, match.category
         
         return False, None
     
+    def close(self):
+        """Encerra o pool de downloads de artigos e a sessão HTTP"""
+        self.article_executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+    
+    def _get(self, url: str, portal: str = None, timeout: int = 30, headers: Dict = None) -> requests.Response:
+        """GET com rate limiting por host (token bucket compartilhado)"""
+        limits = PORTAL_RATE_LIMITS.get(portal, {})
+        host_rate_limiter.acquire(url, limits.get('rate_limit'), limits.get('burst'))
+        return self.session.get(url, timeout=timeout, headers=headers)
+    
+    def _get_listing(self, url: str, portal: str):
+        """
+        Baixa uma página de listagem com requisição condicional
+        Retorna None se a página não mudou desde o último processamento
+        """
+        response = self._get(url, portal, headers=self.page_cache.conditional_headers(url))
+        response.raise_for_status()
+        
+        if self.page_cache.is_unchanged(url, response):
+            return None
+        
+        return response
+    
     def clean_text(self, text: str) -> str:
         """Limpa e normaliza texto"""
         if not text:
@@ -69,22 +113,31 @@ class NewsScraper:
         
         return text
     
-    def scrape_prf_news(self) -> List[Dict]:
+    def scrape_prf_news(self) -> ScrapeResult:
         """Scraper para notícias da PRF"""
         news_list = []
+        validators = PendingValidators()
         
         try:
             for url in PORTAL_URLS['PRF']:
                 logger.info(f"Scraping PRF news from: {url}")
                 
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                response = self._get_listing(url, 'PRF')
+                if response is None:
+                    continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = parse_html(response.content, LINKS_ONLY)
                 
                 # Busca por links de notícias (ajuste conforme a estrutura do site)
                 news_links = soup.find_all('a', href=True)
                 
+                # Região de listagem idêntica à do último ciclo: nada novo para extrair
+                fingerprint = self.page_cache.listing_fingerprint(news_links[:20])
+                if self.page_cache.is_listing_unchanged(url, 'PRF', fingerprint):
+                    self.page_cache.remember(url, response)
+                    continue
+                
+                candidates = []
                 for link in news_links[:20]:  # Limita a 20 links por página
                     try:
                         href = link.get('href')
@@ -103,52 +156,53 @@ class NewsScraper:
                         if not title or len(title) < 10:
                             continue
                         
-                        # Verifica se é relevante
-                        is_relevant, category = self.is_relevant_news(title, "")
+                        # Verifica relevância (título normalizado fica em cache no candidato)
+                        candidate = {'title': title, 'url': full_url}
+                        is_relevant, category = self.is_relevant_news(*normalized_fields(candidate, ('title',)))
                         
                         if is_relevant:
-                            # Busca conteúdo completo da notícia
-                            content = self.get_article_content(full_url)
-                            
-                            news_item = {
-                                'title': self.clean_text(title),
-                                'content': self.clean_text(content),
-                                'url': full_url,
-                                'source': 'PRF',
-                                'category': category,
-                                'published_date': datetime.now().isoformat()
-                            }
-                            
-                            news_list.append(news_item)
-                        
-                        # Pequena pausa para não sobrecarregar o servidor
-                        time.sleep(0.5)
+                            # O conteúdo só é buscado depois, para URLs ainda desconhecidas
+                            candidate['category'] = category
+                            candidates.append(candidate)
                         
                     except Exception as e:
                         logger.error(f"Error processing PRF link: {e}")
                         continue
                 
+                news_list.extend(self._fetch_new_articles(candidates, 'PRF'))
+                validators.add_response(url, response)
+                validators.add_listing(url, 'PRF', fingerprint)
+                
         except Exception as e:
             logger.error(f"Error scraping PRF news: {e}")
         
-        return news_list
+        return ScrapeResult(news_list, validators)
     
-    def scrape_pf_news(self) -> List[Dict]:
+    def scrape_pf_news(self) -> ScrapeResult:
         """Scraper para notícias da Polícia Federal"""
         news_list = []
+        validators = PendingValidators()
         
         try:
             for url in PORTAL_URLS['PF']:
                 logger.info(f"Scraping PF news from: {url}")
                 
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                response = self._get_listing(url, 'PF')
+                if response is None:
+                    continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = parse_html(response.content, LINKS_ONLY)
                 
                 # Busca por links de notícias
                 news_links = soup.find_all('a', href=True)
                 
+                # Região de listagem idêntica à do último ciclo: nada novo para extrair
+                fingerprint = self.page_cache.listing_fingerprint(news_links[:20])
+                if self.page_cache.is_listing_unchanged(url, 'PF', fingerprint):
+                    self.page_cache.remember(url, response)
+                    continue
+                
+                candidates = []
                 for link in news_links[:20]:
                     try:
                         href = link.get('href')
@@ -165,49 +219,53 @@ class NewsScraper:
                         if not title or len(title) < 10:
                             continue
                         
-                        is_relevant, category = self.is_relevant_news(title, "")
+                        # Verifica relevância (título normalizado fica em cache no candidato)
+                        candidate = {'title': title, 'url': full_url}
+                        is_relevant, category = self.is_relevant_news(*normalized_fields(candidate, ('title',)))
                         
                         if is_relevant:
-                            content = self.get_article_content(full_url)
-                            
-                            news_item = {
-                                'title': self.clean_text(title),
-                                'content': self.clean_text(content),
-                                'url': full_url,
-                                'source': 'PF',
-                                'category': category,
-                                'published_date': datetime.now().isoformat()
-                            }
-                            
-                            news_list.append(news_item)
-                        
-                        time.sleep(0.5)
+                            # O conteúdo só é buscado depois, para URLs ainda desconhecidas
+                            candidate['category'] = category
+                            candidates.append(candidate)
                         
                     except Exception as e:
                         logger.error(f"Error processing PF link: {e}")
                         continue
                 
+                news_list.extend(self._fetch_new_articles(candidates, 'PF'))
+                validators.add_response(url, response)
+                validators.add_listing(url, 'PF', fingerprint)
+                
         except Exception as e:
             logger.error(f"Error scraping PF news: {e}")
         
-        return news_list
+        return ScrapeResult(news_list, validators)
     
-    def scrape_brigada_militar_news(self) -> List[Dict]:
+    def scrape_brigada_militar_news(self) -> ScrapeResult:
         """Scraper para notícias da Brigada Militar"""
         news_list = []
+        validators = PendingValidators()
         
         try:
             for url in PORTAL_URLS['Brigada_Militar']:
                 logger.info(f"Scraping Brigada Militar news from: {url}")
                 
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                response = self._get_listing(url, 'Brigada_Militar')
+                if response is None:
+                    continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = parse_html(response.content, LINKS_ONLY)
                 
                 # Busca por links de notícias
                 news_links = soup.find_all('a', href=True)
                 
+                # Região de listagem idêntica à do último ciclo: nada novo para extrair
+                fingerprint = self.page_cache.listing_fingerprint(news_links[:20])
+                if self.page_cache.is_listing_unchanged(url, 'Brigada Militar', fingerprint):
+                    self.page_cache.remember(url, response)
+                    continue
+                
+                candidates = []
                 for link in news_links[:20]:
                     try:
                         href = link.get('href')
@@ -224,45 +282,43 @@ class NewsScraper:
                         if not title or len(title) < 10:
                             continue
                         
-                        is_relevant, category = self.is_relevant_news(title, "")
+                        # Verifica relevância (título normalizado fica em cache no candidato)
+                        candidate = {'title': title, 'url': full_url}
+                        is_relevant, category = self.is_relevant_news(*normalized_fields(candidate, ('title',)))
                         
                         if is_relevant:
-                            content = self.get_article_content(full_url)
-                            
-                            news_item = {
-                                'title': self.clean_text(title),
-                                'content': self.clean_text(content),
-                                'url': full_url,
-                                'source': 'Brigada Militar',
-                                'category': category,
-                                'published_date': datetime.now().isoformat()
-                            }
-                            
-                            news_list.append(news_item)
-                        
-                        time.sleep(0.5)
+                            # O conteúdo só é buscado depois, para URLs ainda desconhecidas
+                            candidate['category'] = category
+                            candidates.append(candidate)
                         
                     except Exception as e:
                         logger.error(f"Error processing Brigada Militar link: {e}")
                         continue
                 
+                news_list.extend(self._fetch_new_articles(candidates, 'Brigada Militar'))
+                validators.add_response(url, response)
+                validators.add_listing(url, 'Brigada Militar', fingerprint)
+                
         except Exception as e:
             logger.error(f"Error scraping Brigada Militar news: {e}")
         
-        return news_list
+        return ScrapeResult(news_list, validators)
     
-    def scrape_policia_civil_news(self) -> List[Dict]:
+    def scrape_policia_civil_news(self) -> ScrapeResult:
         """Scraper para notícias da Polícia Civil"""
         news_list = []
+        validators = PendingValidators()
         
         try:
             for url in PORTAL_URLS['Policia_Civil']:
                 logger.info(f"Scraping Polícia Civil news from: {url}")
                 
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                response = self._get_listing(url, 'Policia_Civil')
+                if response is None:
+                    continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # Precisa da árvore completa (busca títulos nos elementos pais)
+                soup = parse_html(response.content)
                 
                 # Busca por links de notícias - método mais específico
                 news_links = []
@@ -276,6 +332,13 @@ class NewsScraper:
                 if not news_links:
                     news_links = soup.find_all('a', href=True)
                 
+                # Região de listagem idêntica à do último ciclo: nada novo para extrair
+                fingerprint = self.page_cache.listing_fingerprint(news_links[:30])
+                if self.page_cache.is_listing_unchanged(url, 'Polícia Civil', fingerprint):
+                    self.page_cache.remember(url, response)
+                    continue
+                
+                candidates = []
                 for link in news_links[:30]:  # Aumenta o limite
                     try:
                         href = link.get('href')
@@ -305,51 +368,54 @@ class NewsScraper:
                         if not title or len(title) < 10:
                             continue
                         
-                        # Verifica relevância
-                        is_relevant, category = self.is_relevant_news(title, "")
+                        # Verifica relevância (título normalizado fica em cache no candidato)
+                        candidate = {'title': title, 'url': full_url}
+                        is_relevant, category = self.is_relevant_news(*normalized_fields(candidate, ('title',)))
                         
                         if is_relevant:
-                            content = self.get_article_content(full_url)
-                            
-                            news_item = {
-                                'title': self.clean_text(title),
-                                'content': self.clean_text(content),
-                                'url': full_url,
-                                'source': 'Polícia Civil',
-                                'category': category,
-                                'published_date': datetime.now().isoformat()
-                            }
-                            
-                            news_list.append(news_item)
+                            # O conteúdo só é buscado depois, para URLs ainda desconhecidas
+                            candidate['category'] = category
+                            candidates.append(candidate)
                             logger.info(f"Notícia relevante encontrada: {title[:50]}...")
                         
-                        time.sleep(0.3)  # Reduz o tempo de espera
-                        
                     except Exception as e:
                         logger.error(f"Error processing Polícia Civil link: {e}")
                         continue
                 
+                news_list.extend(self._fetch_new_articles(candidates, 'Polícia Civil'))
+                validators.add_response(url, response)
+                validators.add_listing(url, 'Polícia Civil', fingerprint)
+                
         except Exception as e:
             logger.error(f"Error scraping Polícia Civil news: {e}")
         
-        return news_list
+        return ScrapeResult(news_list, validators)
     
-    def scrape_g1_rs_news(self) -> List[Dict]:
+    def scrape_g1_rs_news(self) -> ScrapeResult:
         """Scraper para notícias do G1 RS"""
         news_list = []
+        validators = PendingValidators()
         
         try:
             for url in PORTAL_URLS['G1_RS']:
                 logger.info(f"Scraping G1 RS news from: {url}")
                 
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                response = self._get_listing(url, 'G1_RS')
+                if response is None:
+                    continue
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = parse_html(response.content, LINKS_ONLY)
                 
                 # Busca por links de notícias
                 news_links = soup.find_all('a', href=True)
                 
+                # Região de listagem idêntica à do último ciclo: nada novo para extrair
+                fingerprint = self.page_cache.listing_fingerprint(news_links[:20])
+                if self.page_cache.is_listing_unchanged(url, 'G1 RS', fingerprint):
+                    self.page_cache.remember(url, response)
+                    continue
+                
+                candidates = []
                 for link in news_links[:20]:
                     try:
                         href = link.get('href')
@@ -366,40 +432,101 @@ class NewsScraper:
                         if not title or len(title) < 10:
                             continue
                         
-                        is_relevant, category = self.is_relevant_news(title, "")
+                        # Verifica relevância (título normalizado fica em cache no candidato)
+                        candidate = {'title': title, 'url': full_url}
+                        is_relevant, category = self.is_relevant_news(*normalized_fields(candidate, ('title',)))
                         
                         if is_relevant:
-                            content = self.get_article_content(full_url)
-                            
-                            news_item = {
-                                'title': self.clean_text(title),
-                                'content': self.clean_text(content),
-                                'url': full_url,
-                                'source': 'G1 RS',
-                                'category': category,
-                                'published_date': datetime.now().isoformat()
-                            }
-                            
-                            news_list.append(news_item)
-                        
-                        time.sleep(0.5)
+                            # O conteúdo só é buscado depois, para URLs ainda desconhecidas
+                            candidate['category'] = category
+                            candidates.append(candidate)
                         
                     except Exception as e:
                         logger.error(f"Error processing G1 RS link: {e}")
                         continue
                 
+                news_list.extend(self._fetch_new_articles(candidates, 'G1 RS'))
+                validators.add_response(url, response)
+                validators.add_listing(url, 'G1 RS', fingerprint)
+                
         except Exception as e:
             logger.error(f"Error scraping G1 RS news: {e}")
         
+        return ScrapeResult(news_list, validators)
+    
+    def _known_urls(self, urls) -> set:
+        """
+        Retorna as URLs que já estão no banco
+        Usa o índice em memória e consulta o banco em lote apenas para as demais
+        """
+        urls = {url for url in urls if url}
+        unknown = urls - self.known_urls
+        
+        if unknown:
+            self.known_urls.update(self.db.get_existing_urls(unknown))
+        
+        return urls & self.known_urls
+    
+    def _fetch_new_articles(self, candidates: List[Dict], source: str) -> List[Dict]:
+        """
+        Busca o conteúdo completo apenas das notícias relevantes ainda não salvas
+        """
+        known = self._known_urls(candidate['url'] for candidate in candidates)
+        new_candidates = []
+        seen = set()
+        
+        for candidate in candidates:
+            url = candidate['url']
+            if url in known or url in seen:
+                logger.debug(f"URL já conhecida, pulando download: {url}")
+                continue
+            seen.add(url)
+            new_candidates.append(candidate)
+        
+        # Downloads em paralelo; map preserva a ordem original das notícias
+        contents = self.article_executor.map(
+            self._get_article_content_limited,
+            [candidate['url'] for candidate in new_candidates]
+        )
+        
+        news_list = []
+        for candidate, content in zip(new_candidates, contents):
+            title, = normalized_fields(candidate, ('title',))
+            location = LOCATION_MATCHER.match(title, normalize(content)).category
+            
+            news_list.append({
+                'title': self.clean_text(candidate['title']),
+                'content': self.clean_text(content),
+                'url': candidate['url'],
+                'source': source,
+                'category': candidate['category'],
+                'location': location,
+                'published_date': datetime.now().isoformat()
+            })
+        
+        skipped = len(candidates) - len(news_list)
+        if skipped:
+            logger.info(f"{source}: {skipped} notícias já conhecidas não foram baixadas novamente")
+        
         return news_list
     
+    def _get_article_content_limited(self, url: str) -> str:
+        """Executa get_article_content respeitando o limite de downloads simultâneos por host"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(ARTICLE_FETCH_PER_HOST))
+        
+        with slot:
+            return self.get_article_content(url)
+    
     def get_article_content(self, url: str) -> str:
         """Extrai o conteúdo completo de um artigo"""
         try:
+            article_rate_limiter.acquire(url)
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content)
             
             # Remove scripts e estilos
             for script in soup(["script", "style"]):
@@ -434,9 +561,13 @@ class NewsScraper:
             logger.error(f"Error getting article content from {url}: {e}")
             return ""
     
-    def scrape_all_sources(self) -> List[Dict]:
-        """Executa scraping de todas as fontes"""
+    def scrape_all_sources(self) -> ScrapeResult:
+        """
+        Executa scraping de todas as fontes
+        Retorna as notícias e os validadores pendentes das páginas (gravar com save_news_to_db)
+        """
         all_news = []
+        validators = PendingValidators()
         
         scrapers = [
             self.scrape_prf_news,
@@ -448,49 +579,45 @@ class NewsScraper:
         
         for scraper in scrapers:
             try:
-                news = scraper()
+                news, source_validators = scraper()
                 all_news.extend(news)
+                validators.extend(source_validators)
                 logger.info(f"Found {len(news)} relevant news from {scraper.__name__}")
             except Exception as e:
                 logger.error(f"Error in {scraper.__name__}: {e}")
         
-        return all_news
+        return ScrapeResult(all_news, validators)
     
-    def save_news_to_db(self, news_list: List[Dict]) -> int:
-        """Salva notícias no banco de dados"""
-        saved_count = 0
+    def save_news_to_db(self, news_list: List[Dict], validators: PendingValidators = None) -> int:
+        """
+        Salva notícias no banco de dados (um único lote por ciclo)
+        Os validadores das páginas são gravados na mesma transação das notícias
+        """
+        validators = validators or PendingValidators()
+        try:
+            new_items = self.db.add_news_bulk([
+                {
+                    'title': news['title'],
+                    'content': news['content'],
+                    'url': news['url'],
+                    'source': news['source'],
+                    'category': news['category'],
+                    'location': news.get('location'),
+                    'published_date': news['published_date']
+                }
+                for news in news_list
+            ], validators.http_entries, validators.listings)
+        except Exception as e:
+            logger.error(f"Error saving news: {e}")
+            return 0
         
-        for news in news_list:
-            try:
-                # Verifica se a notícia já existe
-                news_already_exists = False
-                
-                # Se tem URL, verifica por URL
-                if news['url']:
-                    news_already_exists = self.db.news_exists(news['url'])
-                else:
-                    # Se não tem URL, verifica por título e fonte
-                    news_already_exists = self.db.news_exists_by_title(news['title'], news['source'])
-                
-                if not news_already_exists:
-                    news_id = self.db.add_news(
-                        title=news['title'],
-                        content=news['content'],
-                        url=news['url'],
-                        source=news['source'],
-                        category=news['category'],
-                        published_date=news['published_date']
-                    )
-                    
-                    if news_id:
-                        saved_count += 1
-                        logger.info(f"Saved news: {news['title'][:50]}...")
-                    else:
-                        logger.warning(f"Failed to save news: {news['title'][:50]}...")
-                else:
-                    logger.info(f"News already exists: {news['title'][:50]}...")
-                    
-            except Exception as e:
-                logger.error(f"Error saving news: {e}")
+        for news in new_items:
+            logger.info(f"Saved news: {news['title'][:50]}...")
+            if news['url']:
+                self.known_urls.add(news['url'])
+        
+        skipped = len(news_list) - len(new_items)
+        if skipped:
+            logger.info(f"{skipped} news already existed")
         
-        return saved_count
+        return len(new_items)
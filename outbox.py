@@ -0,0 +1,198 @@
+"""
+Fila persistente de mensagens de saída (outbox)
+Os handlers e as tarefas gravam as mensagens na tabela outbox do SQLite e
+retornam na hora; o OutboxDispatcher drena a fila em lotes pelo Broadcaster
+(limites do Telegram, RetryAfter), com backoff exponencial por mensagem,
+ordem preservada por chat e chaves de idempotência contra envios duplicados.
+Mensagens que estavam sendo enviadas quando o processo parou voltam à fila
+na próxima inicialização.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from telegram import InlineKeyboardMarkup, ReplyKeyboardMarkup
+
+from broadcast import SENT, BLOCKED, RETRY
+from config import (OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL, OUTBOX_MAX_ATTEMPTS,
+                    OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX)
+
+logger = logging.getLogger(__name__)
+
+# Tipos de teclado que podem ser gravados na outbox
+_MARKUP_TYPES = {
+    'inline': InlineKeyboardMarkup,
+    'reply': ReplyKeyboardMarkup
+}
+
+
+def serialize_markup(markup):
+    """Converte um teclado do Telegram em JSON para gravar na outbox"""
+    if markup is None:
+        return None
+
+    for kind, markup_class in _MARKUP_TYPES.items():
+        if isinstance(markup, markup_class):
+            return json.dumps({'type': kind, 'data': markup.to_dict()}, ensure_ascii=False)
+
+    raise TypeError(f"Teclado não suportado na outbox: {type(markup).__name__}")
+
+
+def deserialize_markup(raw, bot=None):
+    """Reconstrói o teclado gravado por serialize_markup"""
+    if not raw:
+        return None
+
+    payload = json.loads(raw)
+    return _MARKUP_TYPES[payload['type']].de_json(payload['data'], bot)
+
+
+class OutboxDispatcher:
+    """
+    Drena a outbox em segundo plano no event loop da aplicação
+    O acesso ao banco passa pelo AsyncNewsDatabase (pool de threads do banco)
+    """
+
+    def __init__(self, adb, broadcaster, batch_size=OUTBOX_BATCH_SIZE, poll_interval=OUTBOX_POLL_INTERVAL,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS, backoff_base=OUTBOX_BACKOFF_BASE, backoff_max=OUTBOX_BACKOFF_MAX):
+        self.adb = adb
+        self.broadcaster = broadcaster
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+        # Métricas da drenagem atual (do primeiro lote até a fila esvaziar)
+        self._drain_started = None
+        self._drain_counts = {}
+
+    async def enqueue(self, messages):
+        """
+        Grava mensagens na outbox e acorda o dispatcher
+        Cada mensagem é um dict com chat_id, text, idempotency_key e, opcionalmente,
+        parse_mode, reply_markup (teclado do Telegram) e disable_web_page_preview
+        """
+        rows = [
+            dict(message, reply_markup=serialize_markup(message.get('reply_markup')))
+            for message in messages
+        ]
+        queued = await self.adb.enqueue_outbox_messages(rows)
+        if queued:
+            self._wakeup.set()
+        return queued
+
+    async def start(self):
+        """Inicia o dispatcher (chamar com o event loop da aplicação rodando)"""
+        recovered = await self.adb.reset_outbox_in_flight()
+        if recovered:
+            logger.info(f"📮 {recovered} mensagens interrompidas voltaram para a outbox")
+
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("📮 Outbox iniciada")
+
+    async def stop(self):
+        """Para o dispatcher depois de concluir o lote em andamento"""
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        logger.info("📮 Outbox finalizada")
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                processed = await self._process_batch()
+            except Exception as e:
+                logger.error(f"Erro no dispatcher da outbox: {e}")
+                processed = 0
+
+            if processed:
+                continue
+
+            self._finish_drain()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _process_batch(self):
+        """Envia um lote de mensagens prontas; retorna quantas foram processadas"""
+        batch = await self.adb.claim_outbox_batch(self.batch_size, time.time())
+        if not batch:
+            return 0
+
+        if self._drain_started is None:
+            self._drain_started = time.monotonic()
+
+        results = await asyncio.gather(*(self._send(message) for message in batch), return_exceptions=True)
+
+        updates = []
+        blocked_chats = []
+        for message, result in zip(batch, results):
+            if isinstance(result, Exception):
+                result = (RETRY, str(result))
+            status, error = result
+
+            update = {'id': message['id'], 'attempts': message['attempts'] + 1, 'last_error': error}
+            if status == SENT:
+                update['status'] = 'sent'
+            elif status == BLOCKED:
+                update['status'] = 'blocked'
+                blocked_chats.append(message['chat_id'])
+            elif status == RETRY and update['attempts'] < self.max_attempts:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (update['attempts'] - 1))
+                update['status'] = 'pending'
+                update['next_attempt_at'] = time.time() + delay
+                logger.info(f"📮 Mensagem {message['idempotency_key']} reagendada em {delay:.0f}s")
+            else:
+                update['status'] = 'failed'
+                logger.warning(f"📮 Mensagem {message['idempotency_key']} descartada: {error}")
+
+            self._drain_counts[update['status']] = self._drain_counts.get(update['status'], 0) + 1
+            updates.append(update)
+
+        await self.adb.update_outbox_messages(updates)
+
+        if blocked_chats:
+            # As demais mensagens desses chats também não seriam entregues
+            await self.adb.block_outbox_chats(blocked_chats)
+            deactivated = await self.adb.deactivate_users(blocked_chats)
+            logger.info(f"🚫 {deactivated} usuários desativados (bot bloqueado)")
+
+        return len(batch)
+
+    async def _send(self, message):
+        kwargs = {'disable_web_page_preview': bool(message['disable_web_page_preview'])}
+        if message['parse_mode']:
+            kwargs['parse_mode'] = message['parse_mode']
+        if message['reply_markup']:
+            kwargs['reply_markup'] = deserialize_markup(message['reply_markup'], self.broadcaster.bot)
+
+        return await self.broadcaster.deliver(message['chat_id'], message['text'], **kwargs)
+
+    def _finish_drain(self):
+        """Registra a vazão da drenagem que acabou de esvaziar a fila"""
+        if self._drain_started is None:
+            return
+
+        elapsed = time.monotonic() - self._drain_started
+        sent = self._drain_counts.get('sent', 0)
+        rate = sent / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"📮 Outbox drenada: {sent} enviadas em {elapsed:.1f}s ({rate:.1f} msg/s), "
+            f"{self._drain_counts.get('blocked', 0)} bloqueadas, {self._drain_counts.get('pending', 0)} reagendadas, "
+            f"{self._drain_counts.get('failed', 0)} falhas"
+        )
+        self._drain_started = None
+        self._drain_counts = {}
@@ -0,0 +1,130 @@
+"""
+Cache de validadores HTTP das páginas de listagem
+Guarda ETag, Last-Modified e o hash do corpo de cada URL no SQLite para
+enviar requisições condicionais e pular o parsing de páginas inalteradas.
+Também guarda a impressão digital da região de listagem (elementos do seletor
+de artigos), para portais que mudam o HTML ao redor mas não as notícias.
+"""
+
+import hashlib
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Resultado de um ciclo de scraping: notícias encontradas e os validadores das
+# páginas processadas, que só podem ser gravados junto com essas notícias
+ScrapeResult = namedtuple('ScrapeResult', ['news', 'validators'])
+
+
+class PageCache:
+    """Cache persistente de validadores (ETag / Last-Modified / hash) por URL"""
+
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def body_hash(content):
+        """Hash do corpo da resposta"""
+        return hashlib.sha256(content or b"").hexdigest()
+
+    def conditional_headers(self, url):
+        """Headers If-None-Match / If-Modified-Since para a URL, se houver validadores"""
+        entry = self.db.get_http_cache_entry(url)
+        headers = {}
+
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+    def is_unchanged(self, url, response):
+        """
+        Verifica se a página não mudou desde a última vez que foi processada
+        Um 304 ou um corpo com o mesmo hash contam como 'sem alterações'
+        """
+        if response.status_code == 304:
+            logger.info(f"💤 {url}: 304 Not Modified")
+            return True
+
+        entry = self.db.get_http_cache_entry(url)
+        if entry and entry['body_hash'] == self.body_hash(response.content):
+            logger.info(f"💤 {url}: conteúdo idêntico ao anterior")
+            # Atualiza os validadores, que podem ter mudado mesmo com o corpo igual
+            self.remember(url, response)
+            return True
+
+        return False
+
+    def remember(self, url, response):
+        """
+        Salva os validadores da resposta na hora
+        Só para páginas sem nada a gravar; as demais usam PendingValidators
+        """
+        if response.status_code == 304:
+            return
+
+        self.db.save_http_cache_entry(
+            url,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            body_hash=self.body_hash(response.content)
+        )
+
+    @staticmethod
+    def listing_fingerprint(elements):
+        """Impressão digital da região de listagem (elementos do seletor de artigos)"""
+        digest = hashlib.sha256()
+        for element in elements:
+            digest.update(str(element).encode('utf-8', errors='replace'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def is_listing_unchanged(self, url, source, fingerprint):
+        """
+        Verifica se a listagem tem a mesma impressão digital do último processamento
+        Cada acerto é contado como métrica 'sem alterações' da fonte
+        """
+        if self.db.get_listing_fingerprint(url) != fingerprint:
+            return False
+
+        self.db.record_listing_no_change(url)
+        logger.info(f"💤 {source}: listagem sem alterações, extração ignorada")
+        return True
+
+
+class PendingValidators:
+    """
+    Validadores das páginas processadas em um ciclo, ainda não gravados
+    Vão para o banco na mesma transação que salva as notícias dessas páginas
+    (NewsDatabase.add_news_bulk): se a gravação falhar, nenhum validador é
+    salvo e as páginas são processadas de novo no próximo ciclo
+    """
+
+    def __init__(self):
+        self.http_entries = []  # (url, etag, last_modified, body_hash)
+        self.listings = []  # (url, source, fingerprint)
+
+    def add_response(self, url, response):
+        """Registra os validadores de uma resposta processada"""
+        if response.status_code == 304:
+            return
+
+        self.http_entries.append((
+            url,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            PageCache.body_hash(response.content)
+        ))
+
+    def add_listing(self, url, source, fingerprint):
+        """Registra a impressão digital de uma listagem processada"""
+        self.listings.append((url, source, fingerprint))
+
+    def extend(self, other):
+        """Junta os validadores de outro conjunto (ex.: de outra fonte)"""
+        self.http_entries.extend(other.http_entries)
+        self.listings.extend(other.listings)
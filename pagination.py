@@ -0,0 +1,70 @@
+"""
+Paginação das listagens de notícias nos botões inline
+O cursor de uma página é o par (created_at, id) da notícia na borda da página,
+codificado em base 36 para caber no limite de 64 bytes do callback_data.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# Prefixo dos callbacks de paginação (handler: ^pg\|)
+CALLBACK_PREFIX = "pg"
+CALLBACK_DATA_LIMIT = 64  # bytes, limite do Telegram
+
+# Direções de navegação: notícias mais antigas (▶️) ou mais recentes (◀️)
+OLDER = 'o'
+NEWER = 'n'
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+# Pedido de página extraído de um callback_data
+PageRequest = namedtuple('PageRequest', ['view', 'arg', 'page', 'direction', 'cursor'])
+
+
+def _to_base36(number):
+    if number == 0:
+        return '0'
+    digits = []
+    while number:
+        number, remainder = divmod(number, 36)
+        digits.append(_DIGITS[remainder])
+    return ''.join(reversed(digits))
+
+
+def encode_cursor(created_at, news_id):
+    """Codifica (created_at, id) de forma compacta; datas fora do padrão vão em texto"""
+    try:
+        moment = datetime.strptime(created_at, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        timestamp = _to_base36(int(moment.timestamp()))
+    except (TypeError, ValueError):
+        timestamp = f"~{created_at or ''}"
+    return f"{timestamp}.{_to_base36(news_id)}"
+
+
+def decode_cursor(token):
+    """Inverso de encode_cursor: retorna (created_at, id) ou None"""
+    if not token:
+        return None
+
+    timestamp, _, news_id = token.rpartition('.')
+    if timestamp.startswith('~'):
+        created_at = timestamp[1:]
+    else:
+        moment = datetime.fromtimestamp(int(timestamp, 36), tz=timezone.utc)
+        created_at = moment.strftime(_TIMESTAMP_FORMAT)
+    return created_at, int(news_id, 36)
+
+
+def build_page_callback(view, arg, page, direction, cursor):
+    """Monta o callback_data de um botão de navegação"""
+    data = f"{CALLBACK_PREFIX}|{view}|{arg or ''}|{page}|{direction}|{cursor or ''}"
+    if len(data.encode('utf-8')) > CALLBACK_DATA_LIMIT:
+        raise ValueError(f"callback_data excede {CALLBACK_DATA_LIMIT} bytes: {data}")
+    return data
+
+
+def parse_page_callback(data):
+    """Extrai o PageRequest de um callback_data criado por build_page_callback"""
+    _, view, arg, page, direction, cursor = data.split('|', 5)
+    return PageRequest(view, arg or None, int(page), direction, decode_cursor(cursor))
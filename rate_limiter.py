@@ -0,0 +1,106 @@
+"""
+Rate limiter por host (token bucket) compartilhado pelos scrapers
+Cada host (netloc) tem seu próprio balde: só espera quem esgotou o orçamento
+do seu host, e requisições para hosts diferentes nunca esperam umas pelas outras.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Padrões usados quando a fonte não define 'rate_limit' / 'burst'
+DEFAULT_INTERVAL = 1.0  # segundos entre requisições (1 / taxa)
+DEFAULT_BURST = 1  # requisições que podem sair de imediato
+
+
+class TokenBucket:
+    """Token bucket thread-safe que reserva tokens sem bloquear"""
+
+    def __init__(self, interval, burst):
+        self.interval = interval
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, interval=None, burst=None):
+        """Ajusta o balde, mantendo sempre a configuração mais conservadora"""
+        with self._lock:
+            if interval is not None and interval > self.interval:
+                self.interval = interval
+            if burst is not None and burst < self.capacity:
+                self.capacity = burst
+                self.tokens = min(self.tokens, burst)
+
+    def reserve(self, tokens=1):
+        """
+        Reserva tokens e retorna quantos segundos o chamador deve esperar
+        Retorna 0 se ainda havia orçamento disponível
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.interval > 0:
+                refill = (now - self.updated_at) / self.interval
+                self.tokens = min(self.capacity, self.tokens + refill)
+            else:
+                self.tokens = self.capacity
+            self.updated_at = now
+
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens * self.interval
+
+
+class HostRateLimiter:
+    """Conjunto de token buckets indexados pelo netloc da URL"""
+
+    def __init__(self, default_interval=DEFAULT_INTERVAL, default_burst=DEFAULT_BURST):
+        self.default_interval = default_interval
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url, interval=None, burst=None):
+        host = urlparse(url).netloc or url
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    interval if interval is not None else self.default_interval,
+                    burst if burst is not None else self.default_burst
+                )
+                self._buckets[host] = bucket
+                return bucket
+
+        bucket.configure(interval, burst)
+        return bucket
+
+    def reserve(self, url, interval=None, burst=None):
+        """Reserva uma requisição para o host da URL e retorna a espera necessária"""
+        return self._bucket(url, interval, burst).reserve()
+
+    def acquire(self, url, interval=None, burst=None):
+        """Bloqueia a thread atual apenas se o orçamento do host estiver esgotado"""
+        wait_time = self.reserve(url, interval, burst)
+        if wait_time > 0:
+            logger.debug(f"⏳ Rate limit {urlparse(url).netloc}: aguardando {wait_time:.2f}s")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, url, interval=None, burst=None):
+        """Versão assíncrona de acquire (não bloqueia o event loop)"""
+        wait_time = self.reserve(url, interval, burst)
+        if wait_time > 0:
+            logger.debug(f"⏳ Rate limit {urlparse(url).netloc}: aguardando {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+
+# Instância compartilhada por todos os scrapers do processo
+host_rate_limiter = HostRateLimiter()
@@ -0,0 +1,136 @@
+"""
+Retenção e compactação do banco de dados
+Aplica as políticas de RETENTION_POLICIES (idade máxima e máximo de notícias
+por fonte) removendo os registros em lotes pequenos, cada um em uma transação
+curta, para nunca segurar o lock de escrita por muito tempo. Antes de cada
+remoção o lote é gravado em um arquivo NDJSON comprimido (gzip). No fim, as
+páginas liberadas voltam ao sistema (incremental_vacuum) e o banco é otimizado.
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from database import RETENTION_TABLES
+from config import (RETENTION_POLICIES, RETENTION_BATCH_SIZE, RETENTION_BATCH_PAUSE,
+                    RETENTION_ARCHIVE_DIR, RETENTION_VACUUM_PAGES)
+
+logger = logging.getLogger(__name__)
+
+# Condições que valem sempre, independente da política (o que nunca pode ser removido)
+_TABLE_GUARDS = {
+    'outbox': "status IN ('sent', 'failed', 'blocked')"
+}
+
+
+class RetentionManager:
+    """Executa as políticas de retenção sobre um NewsDatabase (código bloqueante)"""
+
+    def __init__(self, db, policies=RETENTION_POLICIES, batch_size=RETENTION_BATCH_SIZE,
+                 batch_pause=RETENTION_BATCH_PAUSE, archive_dir=RETENTION_ARCHIVE_DIR,
+                 vacuum_pages=RETENTION_VACUUM_PAGES):
+        self.db = db
+        self.policies = policies
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.archive_dir = archive_dir
+        self.vacuum_pages = vacuum_pages
+
+    def run(self):
+        """
+        Aplica todas as políticas e compacta o banco; retorna {tabela: removidos}
+        Uma falha ao remover um lote interrompe a execução e é propagada para quem chamou
+        """
+        started = time.monotonic()
+        run_stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        report = {}
+
+        for table, policy in self.policies.items():
+            deleted = 0
+            for where, params in self._rules(table, policy):
+                deleted += self._prune(table, where, params, run_stamp)
+            report[table] = deleted
+            if deleted:
+                logger.info(f"🧹 {table}: {deleted} registros removidos")
+
+        freed = self.db.incremental_vacuum(self.vacuum_pages)
+        self.db.optimize()
+
+        logger.info(
+            f"🧹 Retenção concluída em {time.monotonic() - started:.1f}s: "
+            f"{sum(report.values())} registros removidos, {freed} páginas liberadas"
+        )
+        return report
+
+    def _rules(self, table, policy):
+        """Condições (where, params) da política de uma tabela"""
+        guards = []
+        if table in _TABLE_GUARDS:
+            guards.append(_TABLE_GUARDS[table])
+        if table == 'news' and policy.get('keep_unviewed'):
+            guards.append("viewed = TRUE")
+
+        rules = []
+        if policy.get('max_age_days'):
+            max_age = f"-{int(policy['max_age_days'])} days"
+            rules.append(([f"{RETENTION_TABLES[table]} < datetime('now', ?)"], [max_age]))
+
+        if table == 'news' and policy.get('max_rows_per_source'):
+            for source, created_at, news_id in self.db.get_source_cutoffs(policy['max_rows_per_source']):
+                rules.append((["source = ?", "(created_at, id) <= (?, ?)"], [source, created_at, news_id]))
+
+        return [(" AND ".join(guards + conditions), params) for conditions, params in rules]
+
+    def _prune(self, table, where, params, run_stamp):
+        """Arquiva e remove, em lotes, os registros que atendem a condição"""
+        deleted = 0
+        while True:
+            columns, rows = self.db.get_expired_rows(table, where, params, self.batch_size)
+            if not rows:
+                break
+
+            archive_path = self._archive(table, columns, rows, run_stamp) if self.archive_dir else None
+
+            try:
+                removed = self.db.delete_rows(table, [row[columns.index('id')] for row in rows])
+            except Exception:
+                # O lote continua no banco e a próxima execução o arquivará de novo
+                logger.error(f"❌ Retenção interrompida: falha ao remover {len(rows)} registros de {table} "
+                             f"(lote já arquivado em {archive_path or 'nenhum arquivo'})")
+                raise
+            deleted += removed
+            if not removed or len(rows) < self.batch_size:
+                break
+
+            # Dá vez às outras escritas (scraping, outbox) entre um lote e outro
+            time.sleep(self.batch_pause)
+        return deleted
+
+    def _archive(self, table, columns, rows, run_stamp):
+        """
+        Acrescenta o lote ao arquivo NDJSON comprimido da execução (gravado em disco antes da remoção)
+        Retorna o caminho do arquivo
+        """
+        directory = os.path.join(self.archive_dir, table)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{table}-{run_stamp}.ndjson.gz")
+
+        records = [dict(zip(columns, row)) for row in rows]
+        if table == 'news':
+            # O corpo pode estar comprimido em news_body, que sai junto com a notícia
+            bodies = self.db.get_news_bodies(record['id'] for record in records)
+            for record in records:
+                record['content'] = bodies.get(record['id'], record['content'])
+
+        # Cada lote vira um membro gzip novo no fim do arquivo (gzip lê todos em sequência)
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab') as archive:
+                for record in records:
+                    line = json.dumps(record, ensure_ascii=False, default=str)
+                    archive.write(line.encode('utf-8') + b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
+        return path
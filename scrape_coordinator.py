@@ -0,0 +1,96 @@
+"""
+Coordenação single-flight dos ciclos de scraping
+Só um ciclo completo roda por vez: quem pede uma atualização enquanto outra
+está em andamento aguarda o resultado dela, e pedidos dentro da janela de
+frescor recebem o último resultado sem disparar um novo scraping.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Resultado de um pedido de atualização
+# status: 'ran' (este pedido executou o ciclo), 'joined' (aguardou um ciclo já
+# em andamento) ou 'cached' (resultado recente reaproveitado)
+RefreshResult = namedtuple('RefreshResult', ['found', 'saved', 'finished_at', 'status'])
+
+
+class ScrapeCoordinator:
+    """
+    Single-flight para uma corrotina de ciclo de scraping
+
+    scrape_cycle: função assíncrona sem argumentos que retorna (encontradas, salvas)
+    freshness_window: segundos em que o último resultado é reaproveitado
+    """
+
+    def __init__(self, scrape_cycle, freshness_window=0):
+        self.scrape_cycle = scrape_cycle
+        self.freshness_window = freshness_window
+        self._lock = threading.Lock()
+        self._in_flight = None  # concurrent.futures.Future do ciclo em andamento
+        self._last_result = None
+        self._last_finished_at = None  # time.monotonic() do fim do último ciclo
+
+    @property
+    def is_running(self):
+        return self._in_flight is not None
+
+    async def refresh(self, force=False):
+        """
+        Retorna o resultado de um ciclo de scraping (RefreshResult)
+        force=True ignora a janela de frescor, mas ainda reaproveita um ciclo em andamento
+        """
+        with self._lock:
+            if self._in_flight is not None:
+                future, status = self._in_flight, 'joined'
+            elif not force and self._is_fresh():
+                found, saved, finished_at = self._last_result
+                age = time.monotonic() - self._last_finished_at
+                logger.info(f"♻️ Reaproveitando resultado do scraping de {age:.0f}s atrás")
+                return RefreshResult(found, saved, finished_at, 'cached')
+            else:
+                future, status = Future(), 'ran'
+                self._in_flight = future
+
+        if status == 'joined':
+            logger.info("⏳ Scraping já em andamento, aguardando o resultado")
+        else:
+            # O ciclo roda em uma task própria: cancelar quem pediu não interrompe o ciclo
+            task = asyncio.create_task(self.scrape_cycle())
+            task.add_done_callback(lambda done: self._finish(future, done))
+
+        # concurrent.futures.Future pode ser aguardado de qualquer event loop
+        found, saved, finished_at = await asyncio.shield(asyncio.wrap_future(future))
+        return RefreshResult(found, saved, finished_at, status)
+
+    def _is_fresh(self):
+        return (
+            self._last_result is not None
+            and self.freshness_window > 0
+            and time.monotonic() - self._last_finished_at < self.freshness_window
+        )
+
+    def _finish(self, future, task):
+        """Publica o resultado do ciclo para todos que o aguardam"""
+        with self._lock:
+            self._in_flight = None
+
+            if task.cancelled():
+                future.cancel()
+                return
+
+            error = task.exception()
+            if error is not None:
+                # Falhas não entram no cache: o próximo pedido tenta de novo
+                future.set_exception(error)
+                return
+
+            found, saved = task.result()
+            self._last_result = (found, saved, time.time())
+            self._last_finished_at = time.monotonic()
+            future.set_result(self._last_result)
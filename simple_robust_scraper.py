@@ -5,18 +5,56 @@ Foco em fontes oficiais e confiáveis
 """
 
 import requests
-from bs4 import BeautifulSoup
+import asyncio
 import time
 import logging
 from datetime import datetime, timedelta
 import re
+from rate_limiter import host_rate_limiter
+from html_parsing import parse_html
+from keyword_matcher import KeywordMatcher, build_location_matcher
+from text_normalizer import normalized_fields
+from page_cache import PendingValidators, ScrapeResult
+from config import SEARCH_KEYWORDS, RS_LOCATIONS
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Palavras-chave específicas e precisas
+TARGET_KEYWORDS = [
+    'drogas', 'armas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 
+    'apreensão', 'prisão', 'tráfico', 'facção', 'operação',
+    'gaeco', 'lavagem de dinheiro', 'contas abertas', 'investigação criminal',
+    'bunker', 'entorpecentes', 'desmantela', 'grupo criminoso', 'narcóticos', 'substâncias ilícitas'
+]
+
+# Categorias por palavra-chave do título, em ordem de prioridade
+CATEGORY_RULES = [
+    ('investigação', ['gaeco', 'lavagem', 'investigação']),
+    ('drogas', ['drogas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 'bunker', 'entorpecentes', 'narcóticos']),
+    ('armas', ['armas']),
+    ('tráfico', ['tráfico', 'facção', 'grupo criminoso']),
+    ('policial', ['apreensão', 'prisão', 'operação', 'desmantela'])
+]
+
+# Compilado uma única vez: relevância, categoria e termos em uma passada
+KEYWORD_MATCHER = KeywordMatcher(
+    TARGET_KEYWORDS + SEARCH_KEYWORDS,
+    [(word, category) for category, words in CATEGORY_RULES for word in words],
+    default_category="geral",
+    category_from_title=True
+)
+
+LOCATION_MATCHER = build_location_matcher(RS_LOCATIONS)
+
 class SimpleRobustScraper:
-    def __init__(self):
+    def __init__(self, max_concurrency=5, page_cache=None):
+        # Número máximo de portais buscados ao mesmo tempo no modo concorrente
+        self.max_concurrency = max_concurrency
+        # Cache opcional de validadores HTTP (requisições condicionais)
+        self.page_cache = page_cache
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -70,6 +108,7 @@ class SimpleRobustScraper:
                     'link': 'h2 a',  # Links das notícias
                     'date': '.documentByLine, .summary-view-icon, .date'  # Datas das notícias
                 },
+                'parse_only': ['h2'],  # Só os h2 entram na árvore (página grande do gov.br)
                 'rate_limit': 2.0
             },
             {
@@ -103,6 +142,7 @@ class SimpleRobustScraper:
                     'link': 'h3 a',  # Links das notícias
                     'date': '.data, .date, time, .timestamp, .news-date'  # Datas das notícias
                 },
+                'parse_only': ['h3'],
                 'rate_limit': 3.0,
                 'timeout': 20,  # Timeout específico para BM RS
                 'max_retries': 1,  # Apenas 1 tentativa
@@ -175,6 +215,7 @@ class SimpleRobustScraper:
                     'link': 'h2 a, a[href*="/noticias/"]',    # Links das notícias
                     'date': '.data, .date, time, .materia-data, .publicado'  # Datas das notícias
                 },
+                'parse_only': ['h2', 'a'],
                 'rate_limit': 2.0
             }
         ]
@@ -186,26 +227,8 @@ class SimpleRobustScraper:
         """
         if not title:
             return False
-            
-        # Converte para minúsculas para comparação
-        title_lower = title.lower()
-        content_lower = content.lower()
-        text_to_check = f"{title_lower} {content_lower}"
         
-        # Palavras-chave específicas e precisas
-        target_keywords = [
-            'drogas', 'armas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 
-            'apreensão', 'prisão', 'tráfico', 'facção', 'operação',
-            'gaeco', 'lavagem de dinheiro', 'contas abertas', 'investigação criminal',
-            'bunker', 'entorpecentes', 'desmantela', 'grupo criminoso', 'narcóticos', 'substâncias ilícitas'
-        ]
-        
-        # Verifica se alguma palavra-chave está presente
-        for keyword in target_keywords:
-            if keyword in text_to_check:
-                return True
-                
-        return False
+        return KEYWORD_MATCHER.match(title, content).relevant
 
     def extract_news_data(self, element, selectors, base_url, source_name):
         """
@@ -277,129 +300,234 @@ class SimpleRobustScraper:
             logger.error(f"Erro ao extrair dados: {e}")
             return None
 
-    def scrape_site(self, config):
+    def _fetch_listing(self, config):
         """
-        Faz scraping de um site específico
+        Baixa a página de listagem de um site, com retry e backoff
+        Retorna a resposta ou None se o site falhar
+        """
+        max_retries = config.get('max_retries', 3)
+        timeout = config.get('timeout', 60)
+        
+        for attempt in range(max_retries):
+            try:
+                # Headers específicos para PM SC (contornar bloqueio)
+                headers = self.session.headers.copy()
+                if config['name'] == 'PM SC':
+                    headers.update({
+                        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        'Referer': 'https://www.google.com/',
+                        'Origin': 'https://www.pm.sc.gov.br',
+                        'X-Forwarded-For': '192.168.1.1',
+                        'X-Real-IP': '192.168.1.1'
+                    })
+                
+                # Requisição condicional (If-None-Match / If-Modified-Since)
+                if self.page_cache:
+                    headers.update(self.page_cache.conditional_headers(config['url']))
+                
+                response = self.session.get(config['url'], timeout=timeout, headers=headers)
+                response.raise_for_status()
+                return response
+            except (requests.exceptions.SSLError, requests.exceptions.ConnectionError, 
+                    requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError, 
+                    requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout, 
+                    requests.exceptions.HTTPError, ConnectionResetError) as e:
+                if attempt < max_retries - 1:
+                    wait_time = 2 ** attempt  # Backoff exponencial: 2s, 4s, 8s
+                    logger.warning(f"Tentativa {attempt + 1} falhou para {config['name']}: {e}")
+                    logger.info(f"⏳ Aguardando {wait_time}s antes da próxima tentativa...")
+                    time.sleep(wait_time)
+                    continue
+                else:
+                    # Se configurado para pular em caso de erro
+                    if config.get('skip_on_error', False):
+                        logger.warning(f"⚠️ Pulando {config['name']} devido a falhas de conexão")
+                    else:
+                        logger.error(f"❌ Falha final ao acessar {config['name']} após {max_retries} tentativas: {e}")
+                    return None
+            except Exception as e:
+                logger.error(f"❌ Erro inesperado ao acessar {config['name']}: {e}")
+                return None
+        
+        return None
+
+    def _parse_listing(self, config, content, validators):
+        """
+        Extrai as notícias relevantes do HTML de uma página de listagem
+        A impressão digital da listagem vai para `validators` (gravada com as notícias)
         """
         news_list = []
         
+        # Restringe a árvore às tags da listagem quando a configuração permite
+        soup = parse_html(content, config.get('parse_only'))
+        
+        # Busca por artigos/notícias
+        articles = soup.select(config['selectors']['articles'])[:20]  # Limita a 20 notícias por site
+        logger.info(f"📰 Encontrados {len(articles)} elementos")
+        
+        # Região de listagem idêntica à do último ciclo: nada novo para extrair
+        fingerprint = None
+        if self.page_cache:
+            fingerprint = self.page_cache.listing_fingerprint(articles)
+            if self.page_cache.is_listing_unchanged(config['url'], config['name'], fingerprint):
+                return news_list
+        
+        for article in articles:
+            news_data = self.extract_news_data(article, config['selectors'], config['url'], config['name'])
+            
+            if not news_data:
+                continue
+            
+            # Título normalizado uma única vez e reaproveitado por todos os matchers
+            title, = normalized_fields(news_data, ('title',))
+            
+            # Relevância e categoria (pelo título) em uma única passada
+            match = KEYWORD_MATCHER.match(title)
+            if match.relevant:
+                news_data['category'] = match.category
+                news_data['location'] = LOCATION_MATCHER.match(title).category
+                news_list.append(news_data)
+                logger.info(f"✅ Notícia relevante: {news_data['title'][:50]}... ({', '.join(match.terms)})")
+        
+        logger.info(f"🎯 Total de notícias relevantes encontradas: {len(news_list)}")
+        
+        if fingerprint:
+            validators.add_listing(config['url'], config['name'], fingerprint)
+        
+        return news_list
+
+    def _fetch_and_parse(self, config):
+        """
+        Busca e processa um site, sem rate limiting (usado pelo modo concorrente)
+        Retorna um ScrapeResult: os validadores da página só são gravados junto
+        com as notícias (NewsDatabase.add_news_bulk)
+        """
+        validators = PendingValidators()
         try:
             logger.info(f"🔄 Fazendo scraping: {config['name']}")
             
-            # Rate limiting
-            time.sleep(config.get('rate_limit', 2.0))
-            
-            # Tenta fazer a requisição com retry automático
-            max_retries = config.get('max_retries', 3)
-            timeout = config.get('timeout', 60)
+            response = self._fetch_listing(config)
+            if response is None:
+                return ScrapeResult([], validators)
             
-            for attempt in range(max_retries):
-                try:
-                    # Headers específicos para PM SC (contornar bloqueio)
-                    headers = self.session.headers.copy()
-                    if config['name'] == 'PM SC':
-                        headers.update({
-                            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                            'Referer': 'https://www.google.com/',
-                            'Origin': 'https://www.pm.sc.gov.br',
-                            'X-Forwarded-For': '192.168.1.1',
-                            'X-Real-IP': '192.168.1.1'
-                        })
-                    
-                    response = self.session.get(config['url'], timeout=timeout, headers=headers)
-                    response.raise_for_status()
-                    break
-                except (requests.exceptions.SSLError, requests.exceptions.ConnectionError, 
-                        requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError, 
-                        requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout, 
-                        requests.exceptions.HTTPError, ConnectionResetError) as e:
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # Backoff exponencial: 2s, 4s, 8s
-                        logger.warning(f"Tentativa {attempt + 1} falhou para {config['name']}: {e}")
-                        logger.info(f"⏳ Aguardando {wait_time}s antes da próxima tentativa...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        # Se configurado para pular em caso de erro
-                        if config.get('skip_on_error', False):
-                            logger.warning(f"⚠️ Pulando {config['name']} devido a falhas de conexão")
-                            return []
-                        else:
-                            logger.error(f"❌ Falha final ao acessar {config['name']} após {max_retries} tentativas: {e}")
-                            return []
-                except Exception as e:
-                    logger.error(f"❌ Erro inesperado ao acessar {config['name']}: {e}")
-                    return []
-    
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Página sem alterações desde o último ciclo: não há o que processar
+            if self.page_cache and self.page_cache.is_unchanged(config['url'], response):
+                return ScrapeResult([], validators)
             
-            # Busca por artigos/notícias
-            articles = soup.select(config['selectors']['articles'])
-            logger.info(f"📰 Encontrados {len(articles)} elementos")
+            news_list = self._parse_listing(config, response.content, validators)
             
-            for article in articles[:20]:  # Limita a 20 notícias por site
-                news_data = self.extract_news_data(article, config['selectors'], config['url'], config['name'])
-                
-                if news_data and self.is_relevant_news(news_data['title']):
-                    # Determina categoria baseada na palavra-chave
-                    title_lower = news_data['title'].lower()
-                    
-                    if any(word in title_lower for word in ['gaeco', 'lavagem', 'investigação']):
-                        news_data['category'] = "investigação"
-                    elif any(word in title_lower for word in ['drogas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 'bunker', 'entorpecentes', 'narcóticos']):
-                        news_data['category'] = "drogas"
-                    elif 'armas' in title_lower:
-                        news_data['category'] = "armas"
-                    elif any(word in title_lower for word in ['tráfico', 'facção', 'grupo criminoso']):
-                        news_data['category'] = "tráfico"
-                    elif any(word in title_lower for word in ['apreensão', 'prisão', 'operação', 'desmantela']):
-                        news_data['category'] = "policial"
-                    else:
-                        news_data['category'] = "geral"
-                    
-                    news_list.append(news_data)
-                    logger.info(f"✅ Notícia relevante: {news_data['title'][:50]}...")
+            if self.page_cache:
+                validators.add_response(config['url'], response)
             
-            logger.info(f"🎯 Total de notícias relevantes encontradas: {len(news_list)}")
+            return ScrapeResult(news_list, validators)
             
         except Exception as e:
             logger.error(f"❌ Erro ao fazer scraping de {config['name']}: {e}")
+            return ScrapeResult([], PendingValidators())
+
+    def scrape_site(self, config):
+        """
+        Faz scraping de um site específico
+        """
+        return self._scrape_site(config).news
+
+    def _scrape_site(self, config):
+        """scrape_site com os validadores pendentes da página (ScrapeResult)"""
+        # Rate limiting por host (só espera se o orçamento do host acabou)
+        host_rate_limiter.acquire(config['url'], config.get('rate_limit', 2.0), config.get('burst', 1))
         
-        return news_list
+        return self._fetch_and_parse(config)
+
+    def _deduplicate(self, all_news):
+        """
+        Remove duplicatas baseadas no título
+        """
+        unique_news = []
+        seen_titles = set()
+        
+        for news in all_news:
+            title_key = normalized_fields(news, ('title',))[0].text
+            if title_key not in seen_titles:
+                seen_titles.add(title_key)
+                unique_news.append(news)
+        
+        logger.info(f"📊 Total final: {len(unique_news)} notícias únicas")
+        return unique_news
+
+    async def scrape_all_sites_async(self, max_concurrency=None):
+        """
+        Faz scraping de todos os sites configurados de forma concorrente
+        
+        As requisições de todos os portais são disparadas juntas, limitadas
+        por um teto global de concorrência. A politeness por host fica a
+        cargo do rate limiter compartilhado (token bucket por netloc).
+        """
+        return (await self.scrape_all_sites_with_validators_async(max_concurrency)).news
 
-    def scrape_all_sites(self):
+    async def scrape_all_sites_with_validators_async(self, max_concurrency=None):
+        """
+        scrape_all_sites_async, retornando também os validadores pendentes
+        das páginas (ScrapeResult) para gravar junto com as notícias
+        """
+        configs = self.get_scraping_configs()
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        logger.info(f"🚀 Iniciando scraping concorrente de {len(configs)} sites oficiais...")
+        
+        async def scrape(config):
+            # Espera o orçamento do host antes de ocupar uma vaga global
+            await host_rate_limiter.acquire_async(config['url'], config.get('rate_limit', 2.0), config.get('burst', 1))
+            
+            async with semaphore:
+                return await asyncio.to_thread(self._fetch_and_parse, config)
+        
+        results = await asyncio.gather(*(scrape(config) for config in configs), return_exceptions=True)
+        
+        all_news = []
+        validators = PendingValidators()
+        for config, result in zip(configs, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Erro ao processar {config['name']}: {result}")
+                continue
+            all_news.extend(result.news)
+            validators.extend(result.validators)
+        
+        return ScrapeResult(self._deduplicate(all_news), validators)
+
+    def scrape_all_sites(self, concurrent=True):
         """
         Faz scraping de todos os sites configurados
+        
+        Por padrão usa o modo concorrente (asyncio); com concurrent=False
+        os sites são percorridos um a um.
+        """
+        return self.scrape_all_sites_with_validators(concurrent).news
+
+    def scrape_all_sites_with_validators(self, concurrent=True):
+        """
+        scrape_all_sites, retornando também os validadores pendentes das
+        páginas (ScrapeResult) para gravar junto com as notícias
         """
+        if concurrent:
+            return asyncio.run(self.scrape_all_sites_with_validators_async())
+        
         all_news = []
+        validators = PendingValidators()
         configs = self.get_scraping_configs()
         
         logger.info(f"🚀 Iniciando scraping de {len(configs)} sites oficiais...")
         
         for config in configs:
             try:
-                site_news = self.scrape_site(config)
+                site_news, site_validators = self._scrape_site(config)
                 all_news.extend(site_news)
-                
-                # Rate limiting entre sites
-                time.sleep(1.0)
+                validators.extend(site_validators)
                 
             except Exception as e:
                 logger.error(f"❌ Erro ao processar {config['name']}: {e}")
                 continue
         
-        # Remove duplicatas baseadas no título
-        unique_news = []
-        seen_titles = set()
-        
-        for news in all_news:
-            title_key = news['title'].lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_news.append(news)
-        
-        logger.info(f"📊 Total final: {len(unique_news)} notícias únicas")
-        return unique_news
+        return ScrapeResult(self._deduplicate(all_news), validators)
     
 def main():
     """
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do bot ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import NewsDatabase  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Banco novo (todas as migrações aplicadas) em um diretório temporário"""
+    database = NewsDatabase(str(tmp_path / 'news.db'))
+    yield database
+    database.close()
+
+
+def make_news(count, source='PRF', category='drogas', start=0):
+    """Itens para add_news_bulk com URLs únicas"""
+    return [
+        {
+            'title': f"Operação {i} apreende drogas",
+            'content': f"Corpo da notícia {i}",
+            'url': f"https://example.com/noticia/{i}",
+            'source': source,
+            'category': category,
+            'published_date': '2024-01-01'
+        }
+        for i in range(start, start + count)
+    ]
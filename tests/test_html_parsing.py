@@ -0,0 +1,28 @@
+"""
+Listagens com 'parse_only' (SoupStrainer) devem extrair as mesmas notícias
+que o parsing da página inteira
+"""
+
+import pytest
+
+from benchmark_parsing import HEADING_TAGS, extract, synthetic_listing
+from simple_robust_scraper import SimpleRobustScraper
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    return SimpleRobustScraper()
+
+
+@pytest.mark.parametrize("site", list(HEADING_TAGS))
+def test_strained_parse_matches_full_parse(scraper, site):
+    config = next(config for config in scraper.get_scraping_configs() if config['name'] == site)
+    assert config.get('parse_only')
+
+    content = synthetic_listing(site, size_kb=100)
+    strained = extract(scraper, config, content, strained=True)
+    full = extract(scraper, config, content, strained=False)
+
+    assert strained
+    assert strained == full
+    assert all('/noticias/2024/noticia-' in item['link'] for item in strained)
@@ -0,0 +1,150 @@
+"""
+Paridade do KeywordMatcher com os classificadores if/elif que ele substituiu
+As funções de referência são cópias da lógica antiga dos dois scrapers. Os
+casos de fronteira de palavra e de acentuação mudaram de propósito (busca
+sobre texto normalizado) e têm o resultado esperado fixado à parte.
+"""
+
+import pytest
+
+import news_scrapers
+import simple_robust_scraper
+
+
+def robust_reference(title, content=""):
+    """SimpleRobustScraper antigo: relevância em título+conteúdo, categoria pelo título"""
+    title_lower = title.lower()
+    text_to_check = f"{title_lower} {content.lower()}"
+
+    target_keywords = [
+        'drogas', 'armas', 'maconha', 'cocaína', 'ecstasy', 'skunk',
+        'apreensão', 'prisão', 'tráfico', 'facção', 'operação',
+        'gaeco', 'lavagem de dinheiro', 'contas abertas', 'investigação criminal',
+        'bunker', 'entorpecentes', 'desmantela', 'grupo criminoso', 'narcóticos', 'substâncias ilícitas'
+    ]
+    if not any(keyword in text_to_check for keyword in target_keywords):
+        return False, None
+
+    if any(word in title_lower for word in ['gaeco', 'lavagem', 'investigação']):
+        category = "investigação"
+    elif any(word in title_lower for word in ['drogas', 'maconha', 'cocaína', 'ecstasy', 'skunk', 'bunker', 'entorpecentes', 'narcóticos']):
+        category = "drogas"
+    elif 'armas' in title_lower:
+        category = "armas"
+    elif any(word in title_lower for word in ['tráfico', 'facção', 'grupo criminoso']):
+        category = "tráfico"
+    elif any(word in title_lower for word in ['apreensão', 'prisão', 'operação', 'desmantela']):
+        category = "policial"
+    else:
+        category = "geral"
+    return True, category
+
+
+def news_reference(title, content=""):
+    """NewsScraper antigo: a primeira palavra-chave da lista define a categoria"""
+    text = f"{title} {content}".lower()
+
+    target_keywords = [
+        'drogas', 'armas', 'maconha', 'cocaína', 'ecstasy', 'skunk',
+        'apreensão', 'prisão', 'tráfico', 'facção', 'operação'
+    ]
+    for keyword in target_keywords:
+        if keyword in text:
+            if keyword in ['drogas', 'maconha', 'cocaína', 'ecstasy', 'skunk']:
+                category = "drogas"
+            elif keyword == 'armas':
+                category = "armas"
+            elif keyword in ['tráfico', 'facção']:
+                category = "tráfico"
+            elif keyword in ['apreensão', 'prisão', 'operação']:
+                category = "policial"
+            else:
+                category = "geral"
+            return True, category
+    return False, None
+
+
+def robust_match(title, content=""):
+    match = simple_robust_scraper.KEYWORD_MATCHER.match(title, content)
+    return match.relevant, match.category if match.relevant else None
+
+
+def news_match(title, content=""):
+    match = news_scrapers.KEYWORD_MATCHER.match(title, content)
+    return match.relevant, match.category if match.relevant else None
+
+
+# (título, conteúdo) em que a classificação antiga e a nova devem coincidir
+PARITY_CASES = [
+    # Prioridade: investigação > drogas > armas > tráfico > policial
+    ("GAECO deflagra operação contra tráfico de drogas e armas", ""),
+    ("Investigação criminal apura lavagem de dinheiro de facção", ""),
+    ("Operação apreende drogas e armas de facção", ""),
+    ("Polícia apreende armas em operação contra o tráfico", ""),
+    ("Facção tem líder preso em operação", ""),
+    ("Operação termina com prisão de suspeito", ""),
+    ("Apreensão de maconha em Porto Alegre", ""),
+    ("Cocaína e ecstasy são encontrados em carro", ""),
+    ("Skunk é apreendido em rodoviária", ""),
+    ("Prisão preventiva é decretada", ""),
+    ("Tráfico de armas na fronteira", ""),
+    # Palavra-chave só no conteúdo: relevante, mas a categoria vem do título
+    ("Polícia prende suspeito na capital", "A operação ocorreu durante a madrugada"),
+    ("Homem é detido na BR-116", "Foram encontradas drogas no veículo"),
+    ("Ação da Brigada Militar", "Houve apreensão de armas e munição"),
+    # Irrelevantes nos dois classificadores
+    ("Prefeitura anuncia novo calendário escolar", ""),
+    ("Chuva forte atinge a Serra gaúcha", "Defesa Civil monitora rios"),
+]
+
+
+# Termos que só o SimpleRobustScraper tinha; no NewsScraper vêm agora de SEARCH_KEYWORDS
+SEARCH_ONLY_CASES = [
+    ("Polícia desmantela grupo criminoso no interior", ""),
+    ("Bunker de entorpecentes é descoberto pela polícia", ""),
+]
+
+
+@pytest.mark.parametrize("title,content", PARITY_CASES + SEARCH_ONLY_CASES)
+def test_robust_scraper_parity(title, content):
+    assert robust_match(title, content) == robust_reference(title, content)
+
+
+@pytest.mark.parametrize("title,content", PARITY_CASES)
+def test_news_scraper_parity(title, content):
+    assert news_match(title, content) == news_reference(title, content)
+
+
+@pytest.mark.parametrize("title,content", SEARCH_ONLY_CASES)
+def test_news_scraper_search_keywords(title, content):
+    # SEARCH_KEYWORDS ampliam a relevância sem categoria própria
+    assert news_reference(title, content) == (False, None)
+    assert news_match(title, content) == (True, "geral")
+
+
+@pytest.mark.parametrize("title,expected", [
+    ("GAECO investiga tráfico de drogas e armas", "investigação"),
+    ("Drogas e armas apreendidas com facção", "drogas"),
+    ("Armas de facção apreendidas em operação", "armas"),
+    ("Tráfico: apreensão em operação policial", "tráfico"),
+    ("Apreensão e prisão em operação", "policial"),
+])
+def test_robust_category_priority(title, expected):
+    assert robust_reference(title) == (True, expected)
+    assert robust_match(title) == (True, expected)
+
+
+# Casos que mudaram de propósito com a busca no início de palavra e sem acentos
+@pytest.mark.parametrize("title,old,new", [
+    # "operação" dentro de "Cooperação" e "armas" dentro de "Desarmas" não contam mais
+    ("Cooperação entre estados reforça fronteira", (True, "policial"), (False, None)),
+    ("Desarmas: campanha recolhe brinquedos", (True, "armas"), (False, None)),
+    # Sem acento ou em caixa alta a palavra-chave passa a ser reconhecida
+    ("APREENSAO de carga roubada", (False, None), (True, "policial")),
+    ("Trafico na zona norte", (False, None), (True, "tráfico")),
+])
+def test_word_boundary_changes(title, old, new):
+    assert robust_reference(title) == old
+    assert news_reference(title) == old
+    assert robust_match(title) == new
+    assert news_match(title) == new
@@ -0,0 +1,71 @@
+"""
+news_counters (migração 4): os triggers devem manter os contadores iguais a
+uma contagem completa da tabela news, e rebuild_counters deve corrigir desvios
+"""
+
+from conftest import make_news
+
+
+def scanned_stats(db):
+    """As estatísticas de get_stats calculadas com varreduras completas de news"""
+    with db._get_connection() as conn:
+        total, viewed, sent = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(viewed != 0), 0), COALESCE(SUM(sent_to_telegram != 0), 0) FROM news"
+        ).fetchone()
+        categories = dict(conn.execute(
+            "SELECT category, COUNT(*) FROM news WHERE category IS NOT NULL GROUP BY category"
+        ).fetchall())
+        sources = dict(conn.execute(
+            "SELECT source, COUNT(*) FROM news WHERE source IS NOT NULL GROUP BY source"
+        ).fetchall())
+    return {
+        'total_news': total,
+        'categories': categories,
+        'sources': sources,
+        'unviewed': total - viewed,
+        'unsent': total - sent
+    }
+
+
+def test_counters_follow_inserts_flips_and_deletes(db):
+    inserted = db.add_news_bulk(make_news(6) + make_news(4, source='BM RS', category='armas', start=6))
+    ids = [item['id'] for item in inserted]
+    assert db.get_stats() == scanned_stats(db)
+    assert db.get_total_news_count() == 10
+
+    # Marcar duas vezes a mesma notícia não pode contar em dobro
+    for news_id in ids[:3] + ids[:1]:
+        db.mark_as_viewed(news_id)
+    for news_id in ids[2:5]:
+        db.mark_as_sent(news_id)
+    assert db.get_stats() == scanned_stats(db)
+    assert db.get_stats()['unviewed'] == 7
+    assert db.get_stats()['unsent'] == 7
+
+    # Desmarcar, mudar categoria e fonte
+    with db._get_connection() as conn:
+        conn.execute("UPDATE news SET viewed = FALSE WHERE id = ?", (ids[0],))
+        conn.execute("UPDATE news SET category = 'tráfico', source = 'PC RS' WHERE id IN (?, ?)", (ids[1], ids[7]))
+        conn.commit()
+    assert db.get_stats() == scanned_stats(db)
+
+    # Remover notícias vistas/enviadas e de categorias diferentes
+    db.delete_rows('news', [ids[1], ids[2], ids[9]])
+    stats = db.get_stats()
+    assert stats == scanned_stats(db)
+    assert stats['total_news'] == 7
+
+    assert db.rebuild_counters() == {}
+
+
+def test_rebuild_counters_fixes_drift(db):
+    db.add_news_bulk(make_news(5))
+    with db._get_connection() as conn:
+        conn.execute("UPDATE news_counters SET count = count + 3 WHERE scope = 'total'")
+        conn.execute("UPDATE news_counters SET count = 0 WHERE scope = 'source' AND key = 'PRF'")
+        conn.commit()
+
+    mismatches = db.rebuild_counters()
+    assert mismatches == {('total', ''): (8, 5), ('source', 'PRF'): (0, 5)}
+    assert db.get_stats() == scanned_stats(db)
+    assert db.rebuild_counters() == {}
@@ -0,0 +1,76 @@
+"""
+Paginação por cursor (keyset em created_at, id): percorrer as páginas nas
+duas direções deve visitar cada notícia uma vez, na ordem da listagem,
+inclusive quando várias notícias têm o mesmo created_at
+"""
+
+import pytest
+
+from conftest import make_news
+
+
+@pytest.fixture
+def tied_db(db):
+    """23 notícias de duas fontes em grupos de 3 com o mesmo created_at"""
+    items = db.add_news_bulk(make_news(15) + make_news(8, source='BM RS', start=15))
+    with db._get_connection() as conn:
+        for position, item in enumerate(items):
+            conn.execute(
+                "UPDATE news SET created_at = datetime('2024-01-01', ?) WHERE id = ?",
+                (f"+{position // 3} hours", item['id'])
+            )
+        conn.commit()
+    return db
+
+
+def listing_order(db, where="", params=()):
+    """Ids na ordem esperada da listagem (mais recente primeiro)"""
+    with db._get_connection() as conn:
+        return [row[0] for row in conn.execute(
+            f"SELECT id FROM news {where} ORDER BY created_at DESC, id DESC", params
+        )]
+
+
+def walk_older(fetch, limit):
+    """Percorre da primeira à última página; retorna as páginas (listas de ids)"""
+    pages = []
+    page = fetch(None, 'older', limit)
+    assert not page['has_newer']
+    while True:
+        pages.append([item[0] for item in page['items']])
+        if not page['has_older']:
+            return pages, page
+        page = fetch(page['older_cursor'], 'older', limit)
+        assert page['has_newer']
+
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 23, 50])
+def test_pages_cover_listing_in_both_directions(tied_db, limit):
+    def fetch(cursor, direction, limit):
+        return tied_db.get_all_news_page(cursor, direction, limit)
+
+    expected = listing_order(tied_db)
+    pages, last = walk_older(fetch, limit)
+    assert [news_id for page in pages for news_id in page] == expected
+    assert all(len(page) == limit for page in pages[:-1])
+
+    # Volta da última página até a primeira pelo newer_cursor
+    page = last
+    for previous in reversed(pages[:-1]):
+        page = fetch(page['newer_cursor'], 'newer', limit)
+        assert [item[0] for item in page['items']] == previous
+        assert page['has_older']
+    assert not page['has_newer']
+
+
+def test_filtered_pages_with_ties(tied_db):
+    def fetch(cursor, direction, limit):
+        return tied_db.get_news_page_by_source('BM RS', cursor, direction, limit)
+
+    pages, _ = walk_older(fetch, 3)
+    assert [news_id for page in pages for news_id in page] == listing_order(tied_db, "WHERE source = ?", ('BM RS',))
+
+
+def test_empty_view(tied_db):
+    page = tied_db.get_viewed_news_page()
+    assert page == {'items': [], 'has_newer': False, 'has_older': False, 'newer_cursor': None, 'older_cursor': None}
@@ -0,0 +1,90 @@
+"""
+RetentionManager: os lotes são arquivados (NDJSON gzip, com o corpo das
+notícias) antes de sair do banco, as proteções da política são respeitadas
+e uma falha na remoção interrompe a execução
+"""
+
+import glob
+import gzip
+import json
+
+import pytest
+
+from conftest import make_news
+from retention import RetentionManager
+
+
+def age_news(db, ids, days):
+    with db._get_connection() as conn:
+        conn.executemany(
+            "UPDATE news SET created_at = datetime('now', ?) WHERE id = ?",
+            [(f"-{days} days", news_id) for news_id in ids]
+        )
+        conn.commit()
+
+
+def archived(archive_dir, table):
+    records = []
+    for path in glob.glob(str(archive_dir / table / '*.ndjson.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            records.extend(json.loads(line) for line in archive)
+    return records
+
+
+def remaining_ids(db):
+    with db._get_connection() as conn:
+        return {row[0] for row in conn.execute("SELECT id FROM news")}
+
+
+def manager(db, tmp_path, policy, batch_size=3):
+    return RetentionManager(db, policies={'news': policy}, batch_size=batch_size, batch_pause=0,
+                            archive_dir=tmp_path / 'archive', vacuum_pages=10)
+
+
+def test_expired_news_archived_then_deleted_in_batches(db, tmp_path):
+    ids = [item['id'] for item in db.add_news_bulk(make_news(12))]
+    old, unviewed_old, recent = ids[:7], ids[7:9], ids[9:]
+    age_news(db, old + unviewed_old, 400)
+    for news_id in old + recent:
+        db.mark_as_viewed(news_id)
+
+    report = manager(db, tmp_path, {'max_age_days': 180, 'keep_unviewed': True}).run()
+
+    assert report == {'news': 7}
+    assert remaining_ids(db) == set(unviewed_old + recent)
+
+    records = archived(tmp_path / 'archive', 'news')
+    assert sorted(record['id'] for record in records) == sorted(old)
+    # O corpo sai de news_body e vai junto para o arquivo
+    assert all(record['content'] == f"Corpo da notícia {record['title'].split()[1]}" for record in records)
+
+    with db._get_connection() as conn:
+        orphans = conn.execute("SELECT COUNT(*) FROM news_body WHERE news_id NOT IN (SELECT id FROM news)").fetchone()[0]
+    assert orphans == 0
+    assert db.rebuild_counters() == {}
+
+
+def test_max_rows_per_source_keeps_newest(db, tmp_path):
+    ids = [item['id'] for item in db.add_news_bulk(make_news(5) + make_news(2, source='BM RS', start=5))]
+    for days, news_id in enumerate(reversed(ids[:5])):
+        age_news(db, [news_id], days)
+
+    report = manager(db, tmp_path, {'max_rows_per_source': 2}).run()
+
+    assert report == {'news': 3}
+    assert remaining_ids(db) == set(ids[3:])
+
+
+def test_delete_failure_stops_run_and_keeps_rows(db, tmp_path):
+    ids = [item['id'] for item in db.add_news_bulk(make_news(4))]
+    age_news(db, ids, 400)
+    with db._get_connection() as conn:
+        conn.execute("CREATE TRIGGER block_delete BEFORE DELETE ON news BEGIN SELECT RAISE(ABORT, 'locked'); END")
+        conn.commit()
+
+    with pytest.raises(Exception, match='locked'):
+        manager(db, tmp_path, {'max_age_days': 180}).run()
+
+    # O primeiro lote já estava no arquivo, mas continua no banco para a próxima execução
+    assert remaining_ids(db) == set(ids)
+    assert len(archived(tmp_path / 'archive', 'news')) == 3
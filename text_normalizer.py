@@ -0,0 +1,60 @@
+"""
+Normalização de texto para os matchers de palavras-chave e localidades
+Remove acentos (NFKD), aplica case folding e separa o texto em tokens, para
+que "Apreensão", "APREENSAO" e "apreensao" sejam equivalentes e a busca
+respeite o início das palavras ("operação" não casa dentro de "cooperação").
+"""
+
+import re
+import unicodedata
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class NormalizedText:
+    """
+    Texto normalizado: tokens sem acento em minúsculas, separados por um espaço
+    O texto tem um espaço no início e no fim, marcando as fronteiras de palavra
+    """
+
+    __slots__ = ('original', 'tokens', 'text')
+
+    def __init__(self, original, tokens):
+        self.original = original
+        self.tokens = tokens
+        self.text = f" {' '.join(tokens)} "
+
+    def __str__(self):
+        return self.original
+
+    def __repr__(self):
+        return f"NormalizedText({self.text.strip()!r})"
+
+
+def fold(text):
+    """Remove acentos e aplica case folding"""
+    decomposed = unicodedata.normalize('NFKD', text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def normalize(text):
+    """Normaliza um texto (aceita str ou NormalizedText já normalizado)"""
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(text or "", _TOKEN_RE.findall(fold(text)))
+
+
+def normalized_fields(item, fields=('title', 'content')):
+    """
+    Retorna os campos normalizados de uma notícia (dict)
+    A normalização roda uma única vez e fica guardada no próprio item
+    """
+    cache = item.setdefault('_normalized', {})
+    result = []
+
+    for field in fields:
+        if field not in cache:
+            cache[field] = normalize(item.get(field) or "")
+        result.append(cache[field])
+
+    return result